@@ -7,6 +7,7 @@ Cross-platform compatible paths using pathlib.
 
 import json
 import os
+from functools import lru_cache
 from pathlib import Path
 from typing import Optional
 
@@ -244,12 +245,25 @@ class Config(BaseModel):
 # Configuration Functions
 # =============================================================================
 
+# Parsed config file: (mtime_ns, size, data)
+_config_cache: Optional[tuple] = None
+
+
 def load_config() -> Config:
     """Load configuration from file. Returns default config if file doesn't exist."""
+    global _config_cache
     if CONFIG_PATH.exists():
         try:
-            with open(CONFIG_PATH, "r", encoding="utf-8") as f:
-                data = json.load(f)
+            # Re-read the file only when it changed; a fresh Config is built
+            # every time since callers modify it
+            st = CONFIG_PATH.stat()
+            key = (st.st_mtime_ns, st.st_size)
+            if _config_cache is not None and _config_cache[:2] == key:
+                data = _config_cache[2]
+            else:
+                with open(CONFIG_PATH, "r", encoding="utf-8") as f:
+                    data = json.load(f)
+                _config_cache = (*key, data)
             return Config(**data)
         except (json.JSONDecodeError, Exception) as e:
             print(f"Warning: Could not load config, using defaults. Error: {e}")
@@ -259,6 +273,8 @@ def load_config() -> Config:
 
 def save_config(config: Config) -> bool:
     """Save configuration to file. Returns True on success."""
+    global _config_cache
+    _config_cache = None
     try:
         with open(CONFIG_PATH, "w", encoding="utf-8") as f:
             json.dump(config.model_dump(), f, indent=2, ensure_ascii=False)
@@ -299,6 +315,12 @@ def get_system_prompt(language: str = "it", user_name: str = "User", provider: s
     # Get current time (e.g., "14:30")
     time_str = now.strftime("%H:%M")
     
+    return _render_system_prompt(language, user_name, provider, date_str, time_str)
+
+
+@lru_cache(maxsize=16)
+def _render_system_prompt(language: str, user_name: str, provider: str, date_str: str, time_str: str) -> str:
+    """Format the system prompt template. Cached: inputs only change once a minute."""
     # Use simplified prompt for LOCAL provider
     if provider == "LOCAL":
         # Note: We removed time to ensure KV Cache hits in Ollama (avoid re-evaluating prompt every minute)
@@ -92,6 +92,8 @@ class MemoryDB:
     
     def __init__(self, db_path: Path = DATABASE_PATH):
         self.db_path = db_path
+        # Cached memory count, dropped by every memory write
+        self._memory_count: Optional[int] = None
         self._ensure_db_exists()
     
     def _ensure_db_exists(self):
@@ -126,6 +128,7 @@ class MemoryDB:
                 (key, value, json.dumps(metadata) if metadata else None)
             )
             conn.commit()
+            self._memory_count = None
             return cursor.lastrowid
         finally:
             conn.close()
@@ -181,6 +184,17 @@ class MemoryDB:
         finally:
             conn.close()
     
+    def count_memories(self) -> int:
+        """Return the number of stored memories (cached until the next memory write)."""
+        if self._memory_count is not None:
+            return self._memory_count
+        conn = self._get_conn()
+        try:
+            self._memory_count = conn.execute("SELECT COUNT(*) FROM memories").fetchone()[0]
+            return self._memory_count
+        finally:
+            conn.close()
+    
     def delete_memory(self, memory_id: int) -> bool:
         """Delete a memory by ID. Returns True if deleted."""
         conn = self._get_conn()
@@ -190,6 +204,7 @@ class MemoryDB:
                 (memory_id,)
             )
             conn.commit()
+            self._memory_count = None
             return cursor.rowcount > 0
         finally:
             conn.close()
@@ -200,6 +215,7 @@ class MemoryDB:
         try:
             cursor = conn.execute("DELETE FROM memories")
             conn.commit()
+            self._memory_count = None
             return cursor.rowcount
         finally:
             conn.close()
@@ -232,6 +248,34 @@ class MemoryDB:
         finally:
             conn.close()
     
+    def add_conversations_bulk(
+        self,
+        records: List[Tuple[str, str, str, str, int]]
+    ) -> int:
+        """
+        Add several conversation entries in a single transaction.
+        
+        Args:
+            records: Tuples of (provider, model, user_message, ai_response, tokens_used)
+            
+        Returns:
+            Number of rows inserted
+        """
+        conn = self._get_conn()
+        try:
+            with conn:
+                conn.executemany(
+                    """
+                    INSERT INTO conversations 
+                    (provider, model, user_message, ai_response, tokens_used)
+                    VALUES (?, ?, ?, ?, ?)
+                    """,
+                    records
+                )
+            return len(records)
+        finally:
+            conn.close()
+    
     def get_recent_conversations(
         self, 
         limit: int = 20,
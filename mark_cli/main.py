@@ -7,16 +7,26 @@ A universal AI API wrapper with persistent memory and Rich UI.
 """
 
 import asyncio
+import getpass
+import os
 import sys
 import re
-from datetime import datetime
-from typing import List, Optional
+import time
+from contextlib import suppress
+from functools import lru_cache
+from collections import deque
+from typing import Awaitable, Callable, Deque, Dict, List, Optional, Tuple
 
+import httpx
 from rich.console import Console
+from rich.text import Text
 
 # Local imports
 from .config import (
     AVAILABLE_MODELS,
+    KLEOS_ANALYST_PROMPT,
+    KLEOS_THINKER_PROMPT,
+    UI_MESSAGES,
     Config,
     get_api_key,
     get_system_prompt,
@@ -27,13 +37,124 @@ from .config import (
 )
 from .database import MemoryDB, init_database
 from .memory import MemoryManager
-from .providers import GeminiProvider, GroqProvider
+from . import providers as _providers
 from .providers.base import AIProvider, Message
 from .ui import MarkInterface
 from .ui.components import apply_theme, THEMES
 from .ui.interface import SetupWizard
 
 
+# Provider class names by lowercase provider name (anything else is GOOGLE).
+# Resolved lazily so only the selected provider's SDK gets imported.
+_PROVIDER_CLASSES = {
+    "groq": "GroqProvider",
+    "local": "OllamaProvider",
+    "google": "GeminiProvider",
+}
+
+# ANSI sequence: move cursor up one line and clear it
+_CLEAR_LINE = b"\x1b[F\x1b[K"
+
+
+def _stdout_is_tty() -> bool:
+    """Probe once whether stdout is a terminal that understands ANSI escapes."""
+    try:
+        return sys.stdout.isatty()
+    except (AttributeError, ValueError):
+        return False
+
+
+if _stdout_is_tty():
+    def _clear_prev_line():
+        """Erase the line the user just typed, writing the escape straight to fd 1."""
+        with suppress(OSError):
+            sys.stdout.flush()
+            os.write(1, _CLEAR_LINE)
+else:
+    def _clear_prev_line():
+        """No-op when stdout is piped or redirected."""
+
+
+# Selection menu pieces for /model (plain Text, no markup parsing)
+_SELECT_PROVIDER_HEADER = Text("━━━ SELECT PROVIDER ━━━", style="bold cyan")
+_SELECT_MODEL_HEADER = Text("━━━ SELECT MODEL ━━━", style="bold cyan")
+
+
+@lru_cache(maxsize=64)
+def _menu_row(index: int, label: str, current: bool) -> Text:
+    """Build (and reuse) a numbered menu row, marking the current entry."""
+    return Text(f"  {'→' if current else ' '} [{index}] {label}")
+
+
+# Last formatted "HH:MM" timestamp, keyed by epoch minute
+_hhmm_cache = [-1, ""]
+
+
+def _hhmm_now() -> str:
+    """Current local time as "HH:MM", formatted at most once per minute."""
+    minute = int(time.time()) // 60
+    if minute != _hhmm_cache[0]:
+        _hhmm_cache[0] = minute
+        _hhmm_cache[1] = time.strftime("%H:%M", time.localtime(minute * 60))
+    return _hhmm_cache[1]
+
+
+# Conversation log batching: flush after this many records or seconds
+CONVERSATION_BATCH_SIZE = 16
+CONVERSATION_FLUSH_INTERVAL = 2.0
+
+
+# =============================================================================
+# Language Detection (Kleos)
+# =============================================================================
+
+_LANG_KEYWORDS = {
+    'it': frozenset({
+        'il', 'lo', 'la', 'gli', 'le', 'di', 'da', 'in', 'con', 'su', 'per', 'tra', 'fra', 'che', 'non', 'sono', 
+        'è', 'ho', 'ha', 'abbiamo', 'hanno', 'come', 'perché', 'quando', 'chi', 'quale', 'questo', 'quello',
+        'filtro', 'olio', 'macchina', 'casa', 'lavoro', 'fare', 'dire', 'potere', 'volere', 'un', 'una', 'uno'
+    }),
+    'es': frozenset({
+        'el', 'la', 'los', 'las', 'de', 'en', 'con', 'por', 'para', 'que', 'no', 'son', 
+        'es', 'tengo', 'tiene', 'tenemos', 'tienen', 'como', 'porque', 'cuando', 'quien', 'cual', 'este', 'ese',
+        'hacer', 'decir', 'poder', 'querer', 'un', 'una', 'uno'
+    }),
+    'fr': frozenset({
+        'le', 'la', 'les', 'de', 'en', 'avec', 'par', 'pour', 'est', 'que', 'ne', 'sont',
+        'ai', 'as', 'a', 'avons', 'avez', 'ont', 'comment', 'pourquoi', 'quand', 'qui', 'quel', 'ce', 'cette',
+        'faire', 'dire', 'pouvoir', 'vouloir', 'un', 'une'
+    }),
+    'de': frozenset({
+        'der', 'die', 'das', 'den', 'dem', 'des', 'ein', 'eine', 'und', 'ist', 'nicht',
+        'habe', 'hat', 'haben', 'wie', 'warum', 'wann', 'wer', 'welcher', 'dieser', 'jener',
+        'machen', 'sagen', 'können', 'wollen'
+    }),
+}
+
+# Words of length >= 2
+_LANG_WORD_RE = re.compile(r'\b\w{2,}\b')
+
+_LANG_NAMES = {
+    'it': 'Italian',
+    'en': 'English',
+    'es': 'Spanish',
+    'fr': 'French',
+    'de': 'German'
+}
+
+
+def _detect_lang(text: str) -> str:
+    """Guess the prompt language from common keywords. Defaults to English."""
+    words = set(_LANG_WORD_RE.findall(text.lower()))
+    scores = {l: len(kws.intersection(words)) for l, kws in _LANG_KEYWORDS.items()}
+    
+    # Find the best language, but stick to English if no strong signal
+    best_lang = max(scores, key=scores.get)
+    if scores[best_lang] > 0:
+        return best_lang
+    return 'en'
+
+
 # =============================================================================
 # Application Class
 # =============================================================================
@@ -48,8 +169,27 @@ class MarkApp:
         self.provider: Optional[AIProvider] = None
         self.memory: Optional[MemoryManager] = None
         self.db: Optional[MemoryDB] = None
-        self.context: List[Message] = []
+        # Conversation window; bounded by max_context_messages once config loads
+        self.context: Deque[Message] = deque()
         self._running = False
+        self.last_ttft: float = 0.0
+        # Provider instances by (provider name, API key)
+        self._provider_cache: Dict[Tuple[str, str], AIProvider] = {}
+        # API keys already read from keyring, per provider
+        self._api_key_cache: Dict[str, Optional[str]] = {}
+        # Shared stream cancellation flag, cleared before each response
+        self._cancel_event = asyncio.Event()
+        # Conversations waiting to be written to the database
+        self._write_queue: asyncio.Queue = asyncio.Queue()
+        self._writer_task: Optional[asyncio.Task] = None
+        # Slash command dispatch table (alias -> handler)
+        self._commands = self._build_command_table()
+        # Rolling summary of messages trimmed from the context window
+        self._summary = ""
+        self._summary_task: Optional[asyncio.Task] = None
+        self._summary_generation = 0
+        # Evicted messages waiting to be folded into the summary in one request
+        self._pending_summary: List[Message] = []
     
     async def initialize(self) -> bool:
         """
@@ -61,13 +201,17 @@ class MarkApp:
         # Ensure data directory exists
         MARK_DIR.mkdir(parents=True, exist_ok=True)
         
-        # Initialize database
-        init_database()
+        # Database setup and config + keyring reads are independent I/O:
+        # run them concurrently in worker threads
+        loop = asyncio.get_running_loop()
+        _, self.config = await asyncio.gather(
+            loop.run_in_executor(None, init_database),
+            loop.run_in_executor(None, self._load_settings),
+        )
         self.db = MemoryDB()
         self.memory = MemoryManager(self.db)
         
-        # Load or create config
-        self.config = load_config()
+        self.context = deque(maxlen=self.config.max_context_messages * 2)
         
         # Apply theme from config
         apply_theme(self.config.theme)
@@ -95,7 +239,7 @@ class MarkApp:
                     return False
         
         # Cloud providers need API key
-        api_key = get_api_key(self.config.default_provider)
+        api_key = self._get_api_key(self.config.default_provider)
         
         if not api_key:
             # Run setup wizard
@@ -123,16 +267,52 @@ class MarkApp:
             self.ui.print_error(f"Initialization error: {e}")
             return False
     
+    def _load_settings(self) -> Config:
+        """Load (or create) the config and prefetch the provider's API key."""
+        config = load_config()
+        if config.default_provider.upper() not in ("LOCAL", "NONE"):
+            self._get_api_key(config.default_provider)
+        return config
+    
+    async def _ainput(self, prompt: str = "", reader=None) -> str:
+        """Read a line in a worker thread so the event loop keeps running."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, reader or input, prompt)
+    
+    def _get_api_key(self, provider: str) -> Optional[str]:
+        """Get an API key, hitting the keyring only once per provider."""
+        if provider not in self._api_key_cache:
+            self._api_key_cache[provider] = get_api_key(provider)
+        return self._api_key_cache[provider]
+    
+    def _save_api_key(self, provider: str, api_key: str) -> bool:
+        """Save an API key and refresh the cached value."""
+        self._api_key_cache[provider] = api_key
+        return save_api_key(provider, api_key)
+    
     def _create_provider(self, provider_name: str, api_key: str, model: str) -> AIProvider:
-        """Create the appropriate provider instance based on provider name."""
-        if provider_name.lower() == "groq":
-            return GroqProvider(api_key=api_key, model=model)
-        elif provider_name.lower() == "local":
-            from .providers import OllamaProvider
-            return OllamaProvider(api_key="", model=model)
-        else:
-            # Default to GOOGLE
-            return GeminiProvider(api_key=api_key, model=model)
+        """
+        Get a provider instance for the given name, reusing earlier instances.
+        
+        Cached providers keep their SDK/HTTP clients alive, so switching back
+        to a previously used provider skips client setup.
+        """
+        name = provider_name.lower()
+        key = (name, api_key)
+        provider = self._provider_cache.get(key)
+        
+        if provider is not None and (provider.model == model or provider.set_model(model)):
+            # Start clean: no chat session or usage carried over from before the switch
+            provider.reset_session_usage()
+            if hasattr(provider, 'reset_chat'):
+                provider.reset_chat()
+            return provider
+        
+        # Default to GOOGLE
+        provider_cls = getattr(_providers, _PROVIDER_CLASSES.get(name, "GeminiProvider"))
+        provider = provider_cls(api_key=api_key, model=model)
+        self._provider_cache[key] = provider
+        return provider
     
     async def _run_setup(self) -> bool:
         """Run the setup wizard."""
@@ -148,7 +328,7 @@ class MarkApp:
         model = setup_config.get("model", "gemini-2.5-flash")
         
         if api_key:
-            save_api_key(provider, api_key)
+            self._save_api_key(provider, api_key)
         
         # Update config
         self.config.default_provider = provider
@@ -207,31 +387,42 @@ class MarkApp:
         self.ui.print_footer()
         self.console.print()
         
-        while self._running:
-            try:
-                # Get user input (Standard)
-                user_input = self.ui.prompt_input()
-                
-                if not user_input.strip():
-                    continue
-                
-                # Process input
-                await self._process_input(user_input)
-                
-            except KeyboardInterrupt:
-                self.console.print()
-                self.ui.print_system_message(
-                    "Press Ctrl+C again to exit, or type /quit",
-                    style="warning"
-                )
+        try:
+            while self._running:
                 try:
+                    # Get user input (Standard)
                     user_input = self.ui.prompt_input()
-                    if user_input.strip():
-                        await self._process_input(user_input)
+                    
+                    if not user_input.strip():
+                        continue
+                    
+                    # Process input
+                    await self._process_input(user_input)
+                    
                 except KeyboardInterrupt:
+                    self.console.print()
+                    self.ui.print_system_message(
+                        "Press Ctrl+C again to exit, or type /quit",
+                        style="warning"
+                    )
+                    try:
+                        user_input = self.ui.prompt_input()
+                        if user_input.strip():
+                            await self._process_input(user_input)
+                    except KeyboardInterrupt:
+                        self._running = False
+                except EOFError:
                     self._running = False
-            except EOFError:
-                self._running = False
+        finally:
+            # Make sure queued conversations reach the database, even when
+            # the loop is left through an exception
+            await self._flush_conversations()
+            # No summary request may outlive the clients closed below
+            summary_task = self._summary_task
+            self._reset_summary()
+            if summary_task:
+                await asyncio.wait([summary_task])
+            await self._close_providers()
         
         # Goodbye
         self.console.print()
@@ -257,100 +448,129 @@ class MarkApp:
     
     async def _handle_command(self, command: str):
         """Handle slash commands."""
-        parts = command.lower().split()
-        cmd = parts[0]
-        args = parts[1:] if len(parts) > 1 else []
-        
-        if cmd in ["/quit", "/exit", "/q"]:
-            self._running = False
-            
-        elif cmd in ["/help", "/h", "/?"]:
-            self.ui.print_help()
-            
-        elif cmd in ["/clear", "/cls"]:
-            self.ui.clear()
+        # Only the command itself is case-insensitive; arguments keep their case
+        parts = command.split()
+        cmd = parts[0].lower()
+        args = parts[1:]
+        
+        handler = self._commands.get(cmd)
+        if handler:
+            await handler(args)
+        else:
+            self.ui.print_system_message(
+                f"Unknown command: {cmd}\nUse /help to see commands.",
+                style="warning"
+            )
+    
+    def _build_command_table(self) -> Dict[str, Callable[[List[str]], Awaitable[None]]]:
+        """Map every slash command alias to its handler."""
+        table = {}
+        for aliases, handler in (
+            (("/quit", "/exit", "/q"), self._cmd_quit),
+            (("/help", "/h", "/?"), self._cmd_help),
+            (("/clear", "/cls"), self._cmd_clear),
+            (("/model",), self._handle_model_command),
+            (("/stats",), self._cmd_stats),
+            (("/memory",), self._handle_memory_command),
+            (("/reset",), self._cmd_reset),
+            (("/config",), self._cmd_config),
+            (("/kleos",), self._cmd_kleos),
+            (("/changeusr", "/changename"), self._cmd_change_user),
+            (("/toggle-stats", "/ts"), self._cmd_toggle_stats),
+            (("/theme",), self._cmd_theme),
+        ):
+            for alias in aliases:
+                table[alias] = handler
+        return table
+    
+    # -------------------------------------------------------------------------
+    # Command Handlers
+    # -------------------------------------------------------------------------
+    
+    async def _cmd_quit(self, args: List[str]):
+        """Exit the main loop."""
+        self._running = False
+    
+    async def _cmd_help(self, args: List[str]):
+        """Show available commands."""
+        self.ui.print_help()
+    
+    async def _cmd_clear(self, args: List[str]):
+        """Clear the screen and redraw the header."""
+        self.ui.clear()
+        self.ui.print_header(
+            model=self.config.default_model,
+            provider=self.config.default_provider
+        )
+    
+    async def _cmd_stats(self, args: List[str]):
+        """Show detailed statistics."""
+        self._show_stats()
+    
+    async def _cmd_reset(self, args: List[str]):
+        """Reset the chat session."""
+        self.context.clear()
+        self._reset_summary()
+        if self.provider:
+            self.provider.reset_session_usage()
+            if hasattr(self.provider, 'reset_chat'):
+                self.provider.reset_chat()
+        self.ui.print_system_message("Session reset.", style="success")
+    
+    async def _cmd_config(self, args: List[str]):
+        """Re-run the setup wizard."""
+        await self._run_setup()
+    
+    async def _cmd_kleos(self, args: List[str]):
+        """Run a prompt through Kleos mode."""
+        prompt = " ".join(args).strip()
+        if not prompt:
+            self.ui.print_system_message("Usage: /kleos <prompt>", "warning")
+        else:
+            await self._handle_kleos_mode(prompt)
+    
+    async def _cmd_change_user(self, args: List[str]):
+        """Change the user name."""
+        new_name = " ".join(args).strip()
+        if not new_name:
+            self.ui.print_system_message("Usage: /changeusr <new_name>", "warning")
+        else:
+            self.config.user_name = new_name
+            save_config(self.config)
+            self.ui.print_system_message(f"User name updated to: {new_name}", "success")
+    
+    async def _cmd_toggle_stats(self, args: List[str]):
+        """Show/hide per-response statistics."""
+        self.config.show_stats = not self.config.show_stats
+        save_config(self.config)
+        status = "enabled" if self.config.show_stats else "disabled"
+        self.ui.print_system_message(f"Response statistics {status}.", "success")
+    
+    async def _cmd_theme(self, args: List[str]):
+        """List themes or switch to one."""
+        theme_name = args[0].lower() if args else ""
+        if not theme_name:
+            self.ui.print_system_message(
+                f"Available themes: {', '.join(THEMES.keys())}\nUsage: /theme <name>",
+                "info"
+            )
+        elif apply_theme(theme_name):
+            self.config.theme = theme_name
+            save_config(self.config)
+            self.ui.print_system_message(f"Theme updated to: {theme_name}", "success")
+            # Refresh header to show new colors
             self.ui.print_header(
                 model=self.config.default_model,
                 provider=self.config.default_provider
             )
-            
-        elif cmd == "/model":
-            # Pass the input queue to handle interactive prompts if needed
-            # Since self.ui.prompt_input is blocking, we can just use that inside the handler
-            await self._handle_model_command(args)
-            
-        elif cmd == "/stats":
-            self._show_stats()
-            
-        elif cmd == "/memory":
-            await self._handle_memory_command(args)
-            
-        elif cmd == "/reset":
-            self.context = []
-            if self.provider:
-                self.provider.reset_session_usage()
-                if hasattr(self.provider, 'reset_chat'):
-                    self.provider.reset_chat()
-            self.ui.print_system_message("Session reset.", style="success")
-            
-        elif cmd == "/config":
-            await self._run_setup()
-        
-        elif cmd == "/kleos":
-            prompt = " ".join(args).strip()
-            if not prompt:
-                self.ui.print_system_message("Usage: /kleos <prompt>", "warning")
-            else:
-                await self._handle_kleos_mode(prompt)
-            
-        elif cmd in ["/changeusr", "/changename"]:
-            new_name = " ".join(args).strip()
-            if not new_name:
-                self.ui.print_system_message("Usage: /changeusr <new_name>", "warning")
-            else:
-                self.config.user_name = new_name
-                save_config(self.config)
-                self.ui.print_system_message(f"User name updated to: {new_name}", "success")
-            
-        elif cmd in ["/toggle-stats", "/ts"]:
-            self.config.show_stats = not self.config.show_stats
-            save_config(self.config)
-            status = "enabled" if self.config.show_stats else "disabled"
-            self.ui.print_system_message(f"Response statistics {status}.", "success")
-            
-        elif cmd == "/theme":
-            theme_name = args[0] if args else ""
-            if not theme_name:
-                self.ui.print_system_message(
-                    f"Available themes: {', '.join(THEMES.keys())}\nUsage: /theme <name>",
-                    "info"
-                )
-            else:
-                if apply_theme(theme_name):
-                    self.config.theme = theme_name
-                    save_config(self.config)
-                    self.ui.print_system_message(f"Theme updated to: {theme_name}", "success")
-                    # Refresh header to show new colors
-                    self.ui.print_header(
-                        model=self.config.default_model,
-                        provider=self.config.default_provider
-                    )
-                else:
-                    self.ui.print_error(
-                        f"Theme '{theme_name}' not found.",
-                        suggestion=f"Available: {', '.join(THEMES.keys())}"
-                    )
-
         else:
-            self.ui.print_system_message(
-                f"Unknown command: {cmd}\nUse /help to see commands.",
-                style="warning"
+            self.ui.print_error(
+                f"Theme '{theme_name}' not found.",
+                suggestion=f"Available: {', '.join(THEMES.keys())}"
             )
     
     async def _handle_model_command(self, args: List[str]):
         """Handle /model command - unified provider/model selection."""
-        import httpx
-        
         # Check if Ollama is running and get available models
         ollama_models = []
         ollama_available = False
@@ -371,19 +591,19 @@ class MarkApp:
         
         # STEP 1: Provider Selection
         self.console.print()
-        self.console.print("[bold cyan]━━━ SELECT PROVIDER ━━━[/]")
+        self.console.print(_SELECT_PROVIDER_HEADER)
+        current_provider = self.config.default_provider.upper()
         for i, p in enumerate(providers, 1):
-            indicator = "→" if p.upper() == self.config.default_provider.upper() else " "
             label = p.upper()
             if p == "LOCAL":
                 label = f"LOCAL - Ollama ({len(ollama_models)} models)"
-            self.console.print(f"  {indicator} [{i}] {label}")
+            self.console.print(_menu_row(i, label, p.upper() == current_provider))
         
         if not ollama_available:
             self.console.print("[dim]  (LOCAL not available - Ollama not running)[/]")
         
         self.console.print(f"\nChoice (1-{len(providers)}, Enter to keep current): ", end="")
-        provider_choice = input().strip()
+        provider_choice = (await self._ainput()).strip()
         
         # Determine selected provider
         if provider_choice:
@@ -401,7 +621,7 @@ class MarkApp:
         # STEP 1b: Check/Get API Key for provider (skip for LOCAL)
         api_key = ""
         if new_provider.upper() != "LOCAL":
-            api_key = get_api_key(new_provider)
+            api_key = self._get_api_key(new_provider)
             
             if not api_key:
                 self.console.print()
@@ -414,37 +634,32 @@ class MarkApp:
                 
                 self.console.print("API key: ", end="")
                 try:
-                    import getpass
-                    api_key = getpass.getpass(prompt="")
+                    api_key = await self._ainput(reader=getpass.getpass)
                 except Exception:
-                    api_key = input()
+                    api_key = await self._ainput()
                 
                 if not api_key or len(api_key) < 10:
                     self.ui.print_error("Invalid API key. Aborting.")
                     return
                 
-                save_api_key(new_provider, api_key)
+                self._save_api_key(new_provider, api_key)
                 self.ui.print_system_message("API key saved.", "success")
         
         # STEP 2: Model Selection
         if new_provider.upper() == "LOCAL":
             available_models = ollama_models
-            display_names = ollama_models
         else:
             available_models = AVAILABLE_MODELS.get(new_provider, [])
-            display_names = available_models
         
         self.console.print()
-        self.console.print("[bold cyan]━━━ SELECT MODEL ━━━[/]")
-        for i, m in enumerate(display_names, 1):
+        self.console.print(_SELECT_MODEL_HEADER)
+        for i, m in enumerate(available_models, 1):
             # Check if this is the current model (handle language suffix)
-            full_model = available_models[i-1]
-            is_current = self.config.default_model == full_model or self.config.default_model.startswith(m.replace('.gguf', ''))
-            indicator = "→" if is_current else " "
-            self.console.print(f"  {indicator} [{i}] {m}")
+            is_current = self.config.default_model == m or self.config.default_model.startswith(m.replace('.gguf', ''))
+            self.console.print(_menu_row(i, m, is_current))
         
         self.console.print(f"\nChoice (1-{len(available_models)}, default 1): ", end="")
-        model_choice = input().strip()
+        model_choice = (await self._ainput()).strip()
         
         try:
             idx = int(model_choice) - 1
@@ -524,32 +739,30 @@ class MarkApp:
     
     async def _handle_memory_command(self, args: List[str]):
         """Handle /memory command."""
-        if not args:
-            args = ["list"]
-        
-        action = args[0]
+        action, *rest = args or ["list"]
+        action = action.lower()
         
         if action == "list":
             memories = self.memory.list_all(limit=20)
             self.ui.print_memories(memories)
             
-        elif action == "search" and len(args) > 1:
-            query = " ".join(args[1:])
-            results = self.memory.search(query)
+        elif action == "search" and rest:
+            results = self.memory.search(" ".join(rest))
             self.ui.print_memories(results)
             
-        elif action == "delete" and len(args) > 1:
+        elif action == "delete" and rest:
             try:
-                memory_id = int(args[1])
-                if self.memory.delete(memory_id):
-                    self.ui.print_system_message(
-                        f"Memory #{memory_id} deleted.",
-                        style="success"
-                    )
-                else:
-                    self.ui.print_error(f"Memory #{memory_id} not found.")
+                memory_id = int(rest[0])
             except ValueError:
                 self.ui.print_error("Invalid memory ID.")
+                return
+            if self.memory.delete(memory_id):
+                self.ui.print_system_message(
+                    f"Memory #{memory_id} deleted.",
+                    style="success"
+                )
+            else:
+                self.ui.print_error(f"Memory #{memory_id} not found.")
                 
         elif action == "clear":
             count = self.memory.clear_all()
@@ -601,54 +814,14 @@ class MarkApp:
             )
             return
 
-        from .config import KLEOS_ANALYST_PROMPT, KLEOS_THINKER_PROMPT, UI_MESSAGES
-        
-        # Language management
-        def detect_lang(text: str) -> str:
-            lang_keywords = {
-                'it': {
-                    'il', 'lo', 'la', 'gli', 'le', 'di', 'da', 'in', 'con', 'su', 'per', 'tra', 'fra', 'che', 'non', 'sono', 
-                    'è', 'sono', 'ho', 'ha', 'abbiamo', 'hanno', 'come', 'perché', 'quando', 'chi', 'quale', 'questo', 'quello',
-                    'filtro', 'olio', 'macchina', 'casa', 'lavoro', 'fare', 'dire', 'potere', 'volere', 'un', 'una', 'uno'
-                },
-                'es': {
-                    'el', 'la', 'los', 'las', 'de', 'en', 'con', 'por', 'para', 'que', 'no', 'son', 
-                    'es', 'tengo', 'tiene', 'tenemos', 'tienen', 'como', 'porque', 'cuando', 'quien', 'cual', 'este', 'ese',
-                    'hacer', 'decir', 'poder', 'querer', 'un', 'una', 'uno'
-                },
-                'fr': {
-                    'le', 'la', 'les', 'de', 'en', 'avec', 'par', 'pour', 'est', 'que', 'ne', 'sont',
-                    'ai', 'as', 'a', 'avons', 'avez', 'ont', 'comment', 'pourquoi', 'quand', 'qui', 'quel', 'ce', 'cette',
-                    'faire', 'dire', 'pouvoir', 'vouloir', 'un', 'une'
-                },
-                'de': {
-                    'der', 'die', 'das', 'den', 'dem', 'des', 'ein', 'eine', 'und', 'ist', 'nicht',
-                    'habe', 'hat', 'haben', 'wie', 'warum', 'wann', 'wer', 'welcher', 'dieser', 'jener',
-                    'machen', 'sagen', 'können', 'wollen'
-                },
-            }
-            # Look for words length >= 2
-            words = set(re.findall(r'\b\w{2,}\b', text.lower()))
-            scores = {l: len(words.intersection(kws)) for l, kws in lang_keywords.items()}
-            
-            # Find the best language, but stick to English if no strong signal
-            best_lang = max(scores, key=scores.get)
-            if scores[best_lang] > 0:
-                return best_lang
-            return 'en'
-            
-        lang = detect_lang(original_prompt)
+        lang = _detect_lang(original_prompt)
         locale = UI_MESSAGES.get(lang, UI_MESSAGES["en"])
         
         # 1. Activation UI
-        timestamp = datetime.now().strftime("%H:%M")
+        timestamp = _hhmm_now()
         
         # Clear raw input
-        try:
-            sys.stdout.write("\033[F\033[K")
-            sys.stdout.flush()
-        except:
-            pass
+        _clear_prev_line()
             
         self.ui.print_kleos_user_message(original_prompt, self.config.user_name, timestamp)
         
@@ -656,23 +829,27 @@ class MarkApp:
         # 2. Analyst Phase - Initial Analysis (Streaming)
         analyst_prompt = KLEOS_ANALYST_PROMPT.replace("[INSERISCI QUI IL PROMPT ORIGINALE O LA DESCRIZIONE DEL TASK]", original_prompt)
         
-        cancel_event = asyncio.Event()
-        ai_timestamp = datetime.now().strftime("%H:%M")
+        cancel_event = self._cancel_event
+        cancel_event.clear()
+        # The analyst answers right away: reuse the user timestamp
+        ai_timestamp = timestamp
         
-        lang_names = {
-            'it': 'Italian',
-            'en': 'English',
-            'es': 'Spanish',
-            'fr': 'French',
-            'de': 'German'
-        }
-        target_lang_name = lang_names.get(lang, 'English')
+        target_lang_name = _LANG_NAMES.get(lang, 'English')
+        
+        # Fixed UI strings and system prompts are English; bind them once
+        en = UI_MESSAGES["en"]
+        lang_suffix = f" Respond ONLY in {target_lang_name}."
+        analyst_system = en.get("prompt_analyst_system") + lang_suffix
+        master_system = en.get("prompt_master_system") + lang_suffix
+        kleos_color = self.ui.colors['kleos']
+        confirm_msg = f"  [bold {kleos_color}]{en.get('kleos_confirm')}[/]"
+        modify_msg = f"  [bold {self.ui.colors['info']}]{en.get('kleos_modify')}[/]"
         
         # Use English for system prompts that control fixed AI logic behavior
         try:
             stream = self.provider.stream_message(
                 message=analyst_prompt,
-                system_prompt=UI_MESSAGES["en"].get("prompt_analyst_system") + f" Respond ONLY in {target_lang_name}.",
+                system_prompt=analyst_system,
             )
             
             analyst_full_output, _ = await self.ui.stream_ai_message(
@@ -684,64 +861,68 @@ class MarkApp:
                 language=lang
             )
         except Exception as e:
-            self.ui.print_error(UI_MESSAGES["en"].get("kleos_error_analyst").format(e=e))
+            self.ui.print_error(en.get("kleos_error_analyst").format(e=e))
             return
 
         # 3. Step B: User Answers
-        self.console.print(f"  [bold {self.ui.colors['kleos']}]{UI_MESSAGES['en'].get('kleos_intro')}[/]")
-        user_answer = input("  > ").strip()
+        self.console.print(f"  [bold {kleos_color}]{en.get('kleos_intro')}[/]")
+        user_answer = (await self._ainput("  > ")).strip()
         user_details = [user_answer] if user_answer else []
         
         # 4. Generate & Refine Master Prompt Loop
-        current_context = f"User details: {chr(10).join(user_details)}" if user_details else ""
+        # Static parts are built once; only the details/feedback lines grow per round
+        refinement_head = f"Original prompt: '{original_prompt}'\n"
+        refinement_tail = (
+            f"\n\nBased on the details, generate the optimized MASTER PROMPT in {target_lang_name}. "
+            f"Output ONLY the prompt content."
+        )
+        context_lines = [f"User details: {user_answer}"] if user_details else []
         final_prompt = None
         
         while True:
-            refinement_input = (
-                f"Original prompt: '{original_prompt}'\n"
-                f"{current_context}\n\n"
-                f"Based on the details, generate the optimized MASTER PROMPT in {target_lang_name}. Output ONLY the prompt content."
-            )
+            refinement_input = refinement_head + "\n".join(context_lines) + refinement_tail
             
             try:
                 stream = self.provider.stream_message(
                     message=refinement_input,
-                    system_prompt=UI_MESSAGES["en"].get("prompt_master_system") + f" Respond ONLY in {target_lang_name}.",
+                    system_prompt=master_system,
                 )
                 
                 final_prompt, _ = await self.ui.stream_ai_message(
                     stream=stream,
                     model="Master Prompt",
-                    timestamp=datetime.now().strftime("%H:%M"),
+                    timestamp=_hhmm_now(),
                     cancel_event=cancel_event,
                     style="kleos",
                     language=lang
                 )
             except Exception as e:
-                self.ui.print_error(UI_MESSAGES["en"].get("kleos_error_master").format(e=e))
+                self.ui.print_error(en.get("kleos_error_master").format(e=e))
                 return
 
-            self.console.print(f"  [bold {self.ui.colors['kleos']}]{UI_MESSAGES['en'].get('kleos_confirm')}[/]", end="")
-            choice = input().strip().lower()
+            self.console.print(confirm_msg, end="")
+            choice = (await self._ainput()).strip().lower()
             
             if choice in ['y', 'yes', '']:
                 break
             else:
-                self.console.print(f"  [bold {self.ui.colors['info']}]{UI_MESSAGES['en'].get('kleos_modify')}[/]", end="")
-                feedback = input().strip()
+                self.console.print(modify_msg, end="")
+                feedback = (await self._ainput()).strip()
                 if not feedback:
-                    self.ui.print_system_message(UI_MESSAGES["en"].get("kleos_cancelled"), "info")
+                    self.ui.print_system_message(en.get("kleos_cancelled"), "info")
                     return
-                current_context += f"\nUser feedback for modification: {feedback}"
+                context_lines.append(f"User feedback for modification: {feedback}")
 
         # 5. Thinker Phase (Deep Reasoning)
         
         # Get relevant memories for the final task
-        memories = self.memory.get_relevant_memories(final_prompt)
-        memories_context = self.memory.format_memories_for_context(memories)
+        memories_context = None
+        if self.memory.count:
+            memories = self.memory.get_relevant_memories(final_prompt)
+            memories_context = self.memory.format_memories_for_context(memories)
         
         # Send to AI with Thinker system prompt (Streaming)
-        ai_timestamp = datetime.now().strftime("%H:%M")
+        ai_timestamp = _hhmm_now()
         
         try:
             stream = self.provider.stream_message(
@@ -766,17 +947,13 @@ class MarkApp:
 
         # 5. Save context
         if full_content:
-            self.context.append(Message(role="user", content=original_prompt))
-            self.context.append(Message(role="assistant", content=full_content))
+            self._add_to_context(
+                Message(role="user", content=original_prompt),
+                Message(role="assistant", content=full_content),
+            )
             
             if self.config.auto_save_conversations:
-                self.db.add_conversation(
-                    provider=self.config.default_provider,
-                    model=self.config.default_model,
-                    user_message=f"[KLEOS] {original_prompt}",
-                    ai_response=full_content,
-                    tokens_used=0,
-                )
+                self._save_conversation(f"[KLEOS] {original_prompt}", full_content)
 
     async def _send_to_ai(self, message: str):
         """Send message to AI provider."""
@@ -788,21 +965,19 @@ class MarkApp:
             return
 
         # Show user message
-        timestamp = datetime.now().strftime("%H:%M")
+        timestamp = _hhmm_now()
         
         # CLEAR RAW INPUT TRICK: Move cursor up 1 line and clear it
         # This removes the raw text the user just typed, leaving only the rendered panel below
-        try:
-            sys.stdout.write("\033[F\033[K")
-            sys.stdout.flush()
-        except:
-            pass
+        _clear_prev_line()
             
         self.ui.print_user_message(message, self.config.user_name, timestamp)
         
         # Get relevant memories
-        memories = self.memory.get_relevant_memories(message)
-        memories_context = self.memory.format_memories_for_context(memories)
+        memories_context = None
+        if self.memory.count:
+            memories = self.memory.get_relevant_memories(message)
+            memories_context = self.memory.format_memories_for_context(memories)
         
         # Get system prompt
         # Language is now centrally managed in config.language
@@ -814,8 +989,13 @@ class MarkApp:
             provider=self.config.default_provider
         )
         
+        # Keep trimmed history alive as a compact summary
+        if self._summary:
+            system_prompt += f"\n\nPrior context summary:\n{self._summary}"
+        
         # New response logic with streaming and cancellation support
-        cancel_event = asyncio.Event()
+        cancel_event = self._cancel_event
+        cancel_event.clear()
         full_content = ""
         was_cancelled = False
         
@@ -829,30 +1009,22 @@ class MarkApp:
             )
             
             # Display response with typewriter effect
-            # Wrap in a task so we can cancel it
-            ai_timestamp = datetime.now().strftime("%H:%M")
+            # Cancellation is driven by cancel_event, so await the stream directly
             
-            # Create a task for the streaming
-            async def _stream_with_cancel():
-                return await self.ui.stream_ai_message(
+            # Wait for stream with keyboard interrupt handling
+            start_time = time.monotonic()
+            try:
+                full_content, self.last_ttft = await self.ui.stream_ai_message(
                     stream=stream,
                     model=self.config.default_model,
-                    timestamp=ai_timestamp,
+                    timestamp=timestamp,  # Same turn: reuse the user timestamp
                     cancel_event=cancel_event
                 )
-            
-            stream_task = asyncio.create_task(_stream_with_cancel())
-            
-            # Wait for stream with keyboard interrupt handling
-            start_time = asyncio.get_event_loop().time()
-            try:
-                full_content, self.last_ttft = await stream_task
             except asyncio.CancelledError:
                 was_cancelled = True
                 full_content = ""
             
-            end_time = asyncio.get_event_loop().time()
-            total_duration = end_time - start_time
+            total_duration = time.monotonic() - start_time
                 
         except KeyboardInterrupt:
             # User pressed Ctrl+C - signal cancellation
@@ -869,42 +1041,142 @@ class MarkApp:
         
         # Only update context and save if we got content
         if full_content:
-            # Print stats
-            tokens_in = 0
-            tokens_out = 0
-            if self.provider:
+            # Print stats (estimates are only needed when shown)
+            if self.config.show_stats:
                 # Estimate if provider doesn't support exact count yet
                 tokens_out = len(full_content.split()) * 1.3 # Rough estimate
                 tokens_in = len(message.split()) * 1.3
-            
-            if self.config.show_stats:
                 self.ui.print_response_stats(
-                    ttft=getattr(self, 'last_ttft', 0.0),
+                    ttft=self.last_ttft,
                     tokens_in=int(tokens_in),
                     tokens_out=int(tokens_out),
                     total_time=total_duration
                 )
 
             # Update context
-            self.context.append(Message(role="user", content=message))
-            self.context.append(Message(role="assistant", content=full_content))
-            
-            # Trim context if too long
-            max_context = self.config.max_context_messages * 2
-            if len(self.context) > max_context:
-                self.context = self.context[-max_context:]
+            self._add_to_context(
+                Message(role="user", content=message),
+                Message(role="assistant", content=full_content),
+            )
             
             # Save conversation
             if self.config.auto_save_conversations:
-                self.db.add_conversation(
-                    provider=self.config.default_provider,
-                    model=self.config.default_model,
-                    user_message=message,
-                    ai_response=full_content,
-                    tokens_used=0,
-                )
+                self._save_conversation(message, full_content)
         
         # Usage update hidden by user request (use /stats to see)
+    
+    def _save_conversation(self, user_message: str, ai_response: str):
+        """Queue a conversation for the background database writer."""
+        if self._writer_task is None:
+            self._writer_task = asyncio.create_task(self._conversation_writer())
+        self._write_queue.put_nowait((
+            self.config.default_provider,
+            self.config.default_model,
+            user_message,
+            ai_response,
+            0,
+        ))
+    
+    async def _conversation_writer(self):
+        """Write queued conversations in batches, one transaction each."""
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._write_queue.get()]
+            deadline = loop.time() + CONVERSATION_FLUSH_INTERVAL
+            
+            # Collect more records until the batch is full or the interval ends
+            while len(batch) < CONVERSATION_BATCH_SIZE:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._write_queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+            
+            try:
+                # One retry covers transient failures such as a locked database
+                for attempt in range(2):
+                    try:
+                        await loop.run_in_executor(None, self.db.add_conversations_bulk, batch)
+                        break
+                    except Exception as e:
+                        if attempt:
+                            # History logging must never interrupt the chat
+                            self.ui.print_system_message(
+                                f"Could not save {len(batch)} conversation(s): {e}",
+                                style="warning"
+                            )
+            finally:
+                for _ in batch:
+                    self._write_queue.task_done()
+    
+    async def _flush_conversations(self):
+        """Wait for queued conversations to be written, then stop the writer."""
+        if self._writer_task is None:
+            return
+        await self._write_queue.join()
+        self._writer_task.cancel()
+        self._writer_task = None
+    
+    async def _close_providers(self):
+        """Release HTTP connections held by providers that own a client."""
+        providers = {id(p): p for p in self._provider_cache.values()}
+        if self.provider is not None:
+            providers[id(self.provider)] = self.provider
+        for provider in providers.values():
+            close = getattr(provider, "close", None)
+            if close is not None:
+                with suppress(Exception):
+                    await close()
+    
+    def _add_to_context(self, *messages: Message):
+        """Append to the context window, summarizing messages that fall out of it."""
+        maxlen = self.context.maxlen
+        overflow = len(self.context) + len(messages) - maxlen if maxlen is not None else 0
+        if overflow > 0 and self.provider is not None and self.provider.uses_context_summary:
+            pending = self._pending_summary
+            pending.extend(self.context[i] for i in range(min(overflow, len(self.context))))
+            # Summarize once half the window has been evicted, not on every turn
+            if len(pending) >= max(2, maxlen // 2):
+                self._pending_summary = []
+                self._schedule_summary(pending)
+        self.context.extend(messages)
+    
+    def _schedule_summary(self, evicted: List[Message]):
+        """Fold evicted messages into the rolling summary in the background."""
+        provider = self.provider
+        previous_task = self._summary_task
+        generation = self._summary_generation
+        
+        async def _summarize():
+            # Chain after any pending summary so updates apply in order
+            if previous_task:
+                await asyncio.wait([previous_task])
+            try:
+                summary = await provider.summarize(evicted, prior=self._summary)
+            except Exception:
+                # Keep the previous summary rather than disturbing the chat;
+                # the messages are retried, oldest first, with the next batch.
+                # Capped at one window so a failing provider can't grow it forever
+                if generation == self._summary_generation:
+                    pending = evicted + self._pending_summary
+                    self._pending_summary = pending[-self.context.maxlen:]
+                return
+            # Discard results that finish after a /reset
+            if generation == self._summary_generation:
+                self._summary = summary
+        
+        self._summary_task = asyncio.create_task(_summarize())
+    
+    def _reset_summary(self):
+        """Drop the rolling summary and any pending summarization."""
+        if self._summary_task and not self._summary_task.done():
+            self._summary_task.cancel()
+        self._summary_task = None
+        self._summary_generation += 1
+        self._summary = ""
+        self._pending_summary = []
 
 
 # =============================================================================
@@ -913,6 +1185,10 @@ class MarkApp:
 
 async def async_main():
     """Main entry point."""
+    # Start tasks eagerly so already-resolved awaits skip a loop iteration (3.12+)
+    if hasattr(asyncio, "eager_task_factory"):
+        asyncio.get_running_loop().set_task_factory(asyncio.eager_task_factory)
+    
     app = MarkApp()
     
     # Initialize
@@ -926,8 +1202,19 @@ async def async_main():
 
 def main():
     """Synchronous wrapper for core script execution."""
+    run = asyncio.run
+    try:
+        # uvloop is an optional speedup (not available on Windows)
+        import uvloop
+        if hasattr(uvloop, "run"):
+            run = uvloop.run  # uvloop >= 0.18; install() is deprecated there
+        else:
+            asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+    except ImportError:
+        pass
+    
     try:
-        asyncio.run(async_main())
+        run(async_main())
     except KeyboardInterrupt:
         print("\nGoodbye!")
         sys.exit(0)
@@ -62,6 +62,11 @@ class MemoryManager:
         """
         self.db = db or MemoryDB()
     
+    @property
+    def count(self) -> int:
+        """Number of stored memories (cached by the database layer)."""
+        return self.db.count_memories()
+    
     def is_memory_command(self, message: str) -> bool:
         """
         Check if a message is a memory save command.
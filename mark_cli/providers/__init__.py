@@ -1,10 +1,30 @@
 # Providers package
 """AI Provider implementations for MARK."""
 
+from importlib import import_module
+
 from .base import AIProvider
-from .gemini import GeminiProvider
-from .groq import GroqProvider
-from .local_gguf import LocalGGUFProvider
-from .ollama import OllamaProvider
 
 __all__ = ["AIProvider", "GeminiProvider", "GroqProvider", "LocalGGUFProvider", "OllamaProvider"]
+
+# Provider classes are imported on first access so that only the SDK of the
+# provider actually in use is loaded at startup (PEP 562)
+_LAZY_PROVIDERS = {
+    "GeminiProvider": ".gemini",
+    "GroqProvider": ".groq",
+    "LocalGGUFProvider": ".local_gguf",
+    "OllamaProvider": ".ollama",
+}
+
+
+def __getattr__(name):
+    module_name = _LAZY_PROVIDERS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    provider_cls = getattr(import_module(module_name, __name__), name)
+    globals()[name] = provider_cls
+    return provider_cls
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -0,0 +1,77 @@
+"""
+MARK Provider Prompt Helpers
+
+Message list assembly shared by the OpenAI-style providers
+(Groq, Ollama, local GGUF).
+"""
+
+from functools import lru_cache
+from typing import Dict, Iterable, Iterator, List, Optional
+
+from .base import Message
+
+
+# Message dict keys and role values shared by every request
+ROLE = "role"
+CONTENT = "content"
+SYSTEM = "system"
+USER = "user"
+ASSISTANT = "assistant"
+
+# History roles sent as-is; anything else is sent as ASSISTANT
+_ROLE_MAP = {USER: USER}
+
+# Fixed parts of the MEMORY CONTEXT block
+_MEM_HEADER = "--- MEMORY CONTEXT ---\n<MEMORIES>\n"
+_MEM_FOOTER = "\n</MEMORIES>\n----------------------"
+
+
+def message_dict(msg: Message) -> Dict[str, str]:
+    """Convert a history Message to an API dict (anything not "user" is "assistant")."""
+    return {ROLE: _ROLE_MAP.get(msg.role, ASSISTANT), CONTENT: msg.content}
+
+
+def history_dicts(context: Optional[Iterable[Message]]) -> Iterator[Dict[str, str]]:
+    """Lazily convert conversation history to API dicts."""
+    return (message_dict(msg) for msg in context or ())
+
+
+@lru_cache(maxsize=32)
+def build_system(system_prompt: Optional[str], memories: Optional[str]) -> Optional[str]:
+    """
+    Merge the system prompt and MEMORY CONTEXT block into one system message.
+    
+    Returns:
+        The system message content, or None if there is nothing to send
+    """
+    if not memories:
+        return system_prompt or None
+    memory_content = _MEM_HEADER + memories + _MEM_FOOTER
+    if system_prompt:
+        return f"{system_prompt}\n\n{memory_content}"
+    return memory_content
+
+
+def build_messages(
+    message: str,
+    history: Iterable[Dict[str, str]],
+    system_prompt: Optional[str] = None,
+    memories: Optional[str] = None,
+) -> List[Dict[str, str]]:
+    """
+    Build an OpenAI-compatible messages list.
+    
+    Args:
+        message: The new user message
+        history: Prior turns, already converted to role/content dicts
+        system_prompt: Optional system prompt
+        memories: Optional memories merged into the system message
+        
+    Returns:
+        System message (if any), history, then the new user turn
+    """
+    system_content = build_system(system_prompt, memories)
+    messages = [{ROLE: SYSTEM, CONTENT: system_content}] if system_content else []
+    messages.extend(history)
+    messages.append({ROLE: USER, CONTENT: message})
+    return messages
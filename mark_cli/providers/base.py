@@ -4,12 +4,32 @@ MARK AI Provider Base Class
 Abstract base class for all AI provider implementations.
 """
 
+import asyncio
+import functools
+import hashlib
+import os
+import sys
 from abc import ABC, abstractmethod
-from dataclasses import dataclass
+from collections import OrderedDict
+from dataclasses import dataclass, replace
 from typing import Any, Dict, List, Optional
 
 
-@dataclass
+# Instructions used when condensing evicted conversation history
+SUMMARY_SYSTEM_PROMPT = (
+    "You condense chat transcripts. Write a brief summary (max ~150 words) that preserves "
+    "names, identifiers, decisions and any instructions the user gave. "
+    "Output ONLY the summary, no introductions."
+)
+
+# Max responses kept by the opt-in send_message cache (MARK_CACHE=1)
+RESPONSE_CACHE_SIZE = 64
+
+# dataclass(slots=True) needs Python 3.10+; older versions keep __dict__
+_SLOTS = {"slots": True} if sys.version_info >= (3, 10) else {}
+
+
+@dataclass(**_SLOTS)
 class Message:
     """Represents a chat message."""
     role: str  # "user" or "assistant"
@@ -17,7 +37,7 @@ class Message:
     timestamp: Optional[str] = None
 
 
-@dataclass
+@dataclass(**_SLOTS)
 class UsageStats:
     """Represents API usage statistics."""
     tokens_input: int = 0
@@ -28,7 +48,7 @@ class UsageStats:
     rate_limit_reset: Optional[str] = None
 
 
-@dataclass
+@dataclass(**_SLOTS)
 class AIResponse:
     """Represents a response from an AI provider."""
     content: str
@@ -38,6 +58,41 @@ class AIResponse:
     raw_response: Optional[Any] = None
 
 
+def cached_send_message(func):
+    """
+    Serve repeated send_message calls from the provider's LRU cache.
+    
+    Only active when the MARK_CACHE=1 environment variable is set. Cache
+    hits return a copy of the stored response with empty usage stats so
+    session totals are not counted twice.
+    """
+    @functools.wraps(func)
+    async def wrapper(
+        self,
+        message: str,
+        context: Optional[List["Message"]] = None,
+        system_prompt: Optional[str] = None,
+        memories: Optional[str] = None,
+    ) -> "AIResponse":
+        if not self._cache_enabled:
+            return await func(self, message, context, system_prompt, memories)
+        
+        key = self._cache_key(message, context, system_prompt, memories)
+        cache = self._response_cache
+        cached = cache.get(key)
+        if cached is not None:
+            cache.move_to_end(key)
+            return replace(cached, usage=UsageStats())
+        
+        response = await func(self, message, context, system_prompt, memories)
+        cache[key] = response
+        if len(cache) > RESPONSE_CACHE_SIZE:
+            cache.popitem(last=False)
+        return response
+    
+    return wrapper
+
+
 class AIProvider(ABC):
     """
     Abstract base class for AI providers.
@@ -57,6 +112,8 @@ class AIProvider(ABC):
         self.api_key = api_key
         self.model = model
         self._session_usage = UsageStats()
+        self._cache_enabled = os.environ.get("MARK_CACHE") == "1"
+        self._response_cache: "OrderedDict[bytes, AIResponse]" = OrderedDict()
     
     @property
     @abstractmethod
@@ -118,19 +175,117 @@ class AIProvider(ABC):
         """
         pass
     
+    async def send_many(
+        self,
+        messages: List[str],
+        *,
+        max_concurrency: int = 8,
+        context: Optional[List[Message]] = None,
+        system_prompt: Optional[str] = None,
+        memories: Optional[str] = None,
+    ) -> List[Any]:
+        """
+        Send several independent messages concurrently.
+        
+        Args:
+            messages: The messages to send
+            max_concurrency: Maximum number of requests in flight at once
+            context: Conversation history shared by every request
+            system_prompt: Optional system prompt shared by every request
+            memories: Optional memories shared by every request
+            
+        Returns:
+            One AIResponse per message, in order. Failed requests are
+            returned as their exception instead of raising.
+        """
+        semaphore = asyncio.Semaphore(max_concurrency)
+        
+        async def send_one(message: str) -> AIResponse:
+            async with semaphore:
+                return await self.send_message(
+                    message,
+                    context=context,
+                    system_prompt=system_prompt,
+                    memories=memories,
+                )
+        
+        return await asyncio.gather(
+            *(send_one(message) for message in messages),
+            return_exceptions=True,
+        )
+    
+    @property
+    def uses_context_summary(self) -> bool:
+        """Whether a summary of trimmed history reaches this provider's prompt."""
+        return True
+    
+    async def summarize(self, messages: List[Message], prior: str = "") -> str:
+        """
+        Condense conversation messages into a short summary.
+        
+        Used to keep early instructions alive once old messages are
+        trimmed from the context window.
+        
+        Args:
+            messages: The messages being evicted from context
+            prior: An existing summary to fold into the new one
+            
+        Returns:
+            The summary text
+        """
+        response = await self.send_message(
+            message=self._build_summary_request(messages, prior),
+            system_prompt=SUMMARY_SYSTEM_PROMPT,
+        )
+        return response.content.strip()
+    
+    @staticmethod
+    def _build_summary_request(messages: List[Message], prior: str = "") -> str:
+        """Build the summarization request text from a transcript."""
+        lines = []
+        if prior:
+            lines.append(f"Previous summary:\n{prior}\n")
+        lines.append("Conversation to summarize:")
+        for msg in messages:
+            lines.append(f"{msg.role}: {msg.content}")
+        return "\n".join(lines)
+    
+    def _cache_key(
+        self,
+        message: str,
+        context: Optional[List[Message]],
+        system_prompt: Optional[str],
+        memories: Optional[str],
+    ) -> bytes:
+        """Hash everything that influences a response into a compact cache key."""
+        digest = hashlib.blake2b(digest_size=16)
+        for part in (self.model, system_prompt or "", memories or ""):
+            digest.update(part.encode())
+            digest.update(b"\0")
+        for msg in context or ():
+            digest.update(f"{msg.role}:{msg.content}".encode())
+            digest.update(b"\0")
+        digest.update(message.encode())
+        return digest.digest()
+    
     def get_session_usage(self) -> UsageStats:
         """Get usage statistics for the current session."""
         return self._session_usage
     
     def update_session_usage(self, usage: UsageStats):
         """Update session usage with new request data."""
-        self._session_usage.tokens_input += usage.tokens_input
-        self._session_usage.tokens_output += usage.tokens_output
-        self._session_usage.tokens_total += usage.tokens_total
-        self._session_usage.requests_count += 1
+        self._merge_usage(usage.tokens_input, usage.tokens_output, usage.tokens_total)
         self._session_usage.rate_limit_remaining = usage.rate_limit_remaining
         self._session_usage.rate_limit_reset = usage.rate_limit_reset
     
+    def _merge_usage(self, tokens_input: int, tokens_output: int, tokens_total: int):
+        """Add one request's token counts to the session without building a UsageStats."""
+        session = self._session_usage
+        session.tokens_input += tokens_input
+        session.tokens_output += tokens_output
+        session.tokens_total += tokens_total
+        session.requests_count += 1
+    
     def reset_session_usage(self):
         """Reset session usage statistics."""
         self._session_usage = UsageStats()
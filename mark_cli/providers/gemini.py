@@ -5,20 +5,39 @@ Implementation of the AI provider for Google's Gemini models.
 """
 
 import asyncio
-from typing import Any, Dict, List, Optional
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Tuple
 
 from google import genai
-from google.genai import types
+from google.genai import errors, types
 
 from .base import AIProvider, AIResponse, Message, UsageStats
 
 
+# Fixed parts of the MEMORY CONTEXT block
+_MEM_HEADER = "--- MEMORY CONTEXT (TRANSLATE IF NEEDED) ---\n<MEMORIES>\n"
+_MEM_FOOTER = "\n</MEMORIES>\n------------------------------------------\n\n"
+
+
+@lru_cache(maxsize=4)
+def _memory_block(memories: str) -> str:
+    """Format the MEMORY CONTEXT block prepended to the user message."""
+    return _MEM_HEADER + memories + _MEM_FOOTER
+
+
+def _error_code(error: Exception) -> Optional[int]:
+    """HTTP status of an SDK APIError, or None when the error text must be inspected."""
+    if isinstance(error, errors.APIError):
+        return error.code
+    return None
+
+
 class GeminiProvider(AIProvider):
     """
     Google Gemini AI Provider implementation using the new google-genai SDK.
     """
     
-    MODELS = [
+    MODELS = (
         "gemini-2.5-flash",
         "gemini-2.5-flash-lite",
         "gemini-3-flash-preview",
@@ -28,7 +47,8 @@ class GeminiProvider(AIProvider):
         "gemma-3-27b-es",
         "gemma-3-27b-fr",
         "gemma-3-27b-de",
-    ]
+    )
+    _MODELS_SET = frozenset(MODELS)
     
     def __init__(self, api_key: str, model: str = "gemini-2.5-flash"):
         super().__init__(api_key, model)
@@ -36,13 +56,16 @@ class GeminiProvider(AIProvider):
         # Initialize the new SDK Client
         self.client = genai.Client(api_key=api_key)
         self._chat = None
+        # Gemma does not support system instructions
+        self._is_gemma = "gemma" in model.lower()
+        self._api_model_name = self._get_api_model_name(model)
     
     @property
     def provider_name(self) -> str:
         return "GOOGLE"
     
     @property
-    def available_models(self) -> List[str]:
+    def available_models(self) -> Tuple[str, ...]:
         return self.MODELS
     
     def _get_api_model_name(self, model: str) -> str:
@@ -56,12 +79,69 @@ class GeminiProvider(AIProvider):
 
     def set_model(self, model: str) -> bool:
         """Change the model and reinitialize."""
-        if model in self.available_models:
+        if model in self._MODELS_SET:
             self.model = model
+            self._is_gemma = "gemma" in model.lower()
+            self._api_model_name = self._get_api_model_name(model)
             self._chat = None  # Reset chat session
             return True
         return False
     
+    def _ensure_chat(self, context: Optional[List[Message]], system_prompt: Optional[str]):
+        """
+        Create a chat session when there is none or the context was reset.
+        
+        An existing chat already tracks earlier turns, so the history is
+        only converted when a new session is started.
+        """
+        if self._chat is not None and context:
+            return
+        
+        is_gemma = self._is_gemma
+        history = []
+        if context:
+            for i, msg in enumerate(context):
+                role = "user" if msg.role == "user" else "model"
+                text = msg.content
+                # Inject system prompt into first message for Gemma
+                if i == 0 and is_gemma and system_prompt and role == "user":
+                    text = f"{system_prompt}\n\n{text}"
+                history.append(types.Content(role=role, parts=[types.Part(text=text)]))
+        
+        config = types.GenerateContentConfig(
+            temperature=0.7,
+            top_p=0.95,
+            max_output_tokens=8192,
+            system_instruction=system_prompt if system_prompt and not is_gemma else None
+        )
+        
+        self._chat = self.client.aio.chats.create(
+            model=self._api_model_name,
+            config=config,
+            history=history
+        )
+    
+    def _build_user_message(
+        self,
+        message: str,
+        system_prompt: Optional[str],
+        memories: Optional[str],
+        has_context: bool,
+    ) -> str:
+        """Prepend memories (and the Gemma system prompt on a fresh session) to the message."""
+        if not memories and (has_context or not self._is_gemma):
+            return message
+        
+        parts = []
+        # Gemma gets the system prompt inline when the session starts without history
+        if self._is_gemma and system_prompt and not has_context:
+            parts.append(system_prompt)
+            parts.append("\n\n")
+        if memories:
+            parts.append(_memory_block(memories))
+        parts.append(message)
+        return "".join(parts)
+    
     async def send_message(
         self,
         message: str,
@@ -82,58 +162,8 @@ class GeminiProvider(AIProvider):
             AIResponse with content and usage stats
         """
         try:
-            # Build conversation history for new SDK
-            history = []
-            
-            # Check if model supports system instructions (Gemma does not)
-            is_gemma = "gemma" in self.model.lower()
-            
-            if context:
-                for i, msg in enumerate(context):
-                    role = "user" if msg.role == "user" else "model"
-                    text = msg.content
-                    # Inject system prompt into first message for Gemma
-                    if i == 0 and is_gemma and system_prompt and role == "user":
-                        text = f"{system_prompt}\n\n{text}"
-                    history.append(types.Content(role=role, parts=[types.Part(text=text)]))
-            
-            # Check if model supports system instructions (Gemma does not)
-            is_gemma = "gemma" in self.model.lower()
-            
-            config = types.GenerateContentConfig(
-                temperature=0.7,
-                top_p=0.95,
-                max_output_tokens=8192,
-                system_instruction=system_prompt if system_prompt and not is_gemma else None
-            )
-            
-            # Prepare message
-            user_message = message
-            
-            # Determine if we should inject system prompt (New session AND no history)
-            should_inject_system = is_gemma and system_prompt and (self._chat is None and not history)
-
-            if memories:
-                memory_block = (
-                    f"--- MEMORY CONTEXT (TRANSLATE IF NEEDED) ---\n"
-                    f"<MEMORIES>\n{memories}\n</MEMORIES>\n"
-                    f"------------------------------------------\n\n"
-                )
-                if should_inject_system:
-                     user_message = f"{system_prompt}\n\n{memory_block}{message}"
-                else:
-                     # Just memories, system prompt is already in history
-                     user_message = f"{memory_block}{message}"
-            elif should_inject_system:
-                 user_message = f"{system_prompt}\n\n{message}"
-            
-            # Initialize or use existing chat (Async)
-            if self._chat is None or not history:
-                self._chat = await self.client.aio.chats.create(
-                    model=self._get_api_model_name(self.model),
-                    config=config,
-                    history=history
-                )
+            self._ensure_chat(context, system_prompt)
+            user_message = self._build_user_message(message, system_prompt, memories, bool(context))
             
             # Send message (Async)
             response = await self._chat.send_message(user_message)
@@ -171,11 +201,12 @@ class GeminiProvider(AIProvider):
         except Exception as e:
             # Handle errors gracefully
             error_msg = str(e)
+            code = _error_code(e)
             
             # Check for common errors
-            if "API_KEY_INVALID" in error_msg or "401" in error_msg:
+            if code == 401 or "API_KEY_INVALID" in error_msg or (code is None and "401" in error_msg):
                 raise ValueError("Invalid API key. Please check your Gemini API key.")
-            elif "RATE_LIMIT" in error_msg or "429" in error_msg:
+            elif code == 429 or (code is None and ("RATE_LIMIT" in error_msg or "429" in error_msg)):
                 raise RuntimeError("Rate limit exceeded. Please wait and try again.")
             elif "SAFETY" in error_msg:
                 return AIResponse(
@@ -196,53 +227,8 @@ class GeminiProvider(AIProvider):
     ):
         """Streaming version of send_message."""
         try:
-            # Check if model supports system instructions (Gemma does not)
-            is_gemma = "gemma" in self.model.lower()
-
-            # Build conversation history
-            history = []
-            if context:
-                for i, msg in enumerate(context):
-                    role = "user" if msg.role == "user" else "model"
-                    text = msg.content
-                    # Inject system prompt into first message for Gemma
-                    if i == 0 and is_gemma and system_prompt and role == "user":
-                        text = f"{system_prompt}\n\n{text}"
-                    history.append(types.Content(role=role, parts=[types.Part(text=text)]))
-            
-            config = types.GenerateContentConfig(
-                temperature=0.7,
-                top_p=0.95,
-                max_output_tokens=8192,
-                system_instruction=system_prompt if system_prompt and not is_gemma else None
-            )
-            
-            # Prepare message
-            user_message = message
-            
-            # Determine if we should inject system prompt (New session AND no history)
-            should_inject_system = is_gemma and system_prompt and (self._chat is None and not history)
-
-            if memories:
-                memory_block = (
-                    f"--- MEMORY CONTEXT (TRANSLATE IF NEEDED) ---\n"
-                    f"<MEMORIES>\n{memories}\n</MEMORIES>\n"
-                    f"------------------------------------------\n\n"
-                )
-                if should_inject_system:
-                     user_message = f"{system_prompt}\n\n{memory_block}{message}"
-                else:
-                     user_message = f"{memory_block}{message}"
-            elif should_inject_system:
-                 user_message = f"{system_prompt}\n\n{message}"
-            
-            # Initialize or use existing chat (Async)
-            if self._chat is None or not history:
-                self._chat = self.client.aio.chats.create(
-                    model=self._get_api_model_name(self.model),
-                    config=config,
-                    history=history
-                )
+            self._ensure_chat(context, system_prompt)
+            user_message = self._build_user_message(message, system_prompt, memories, bool(context))
             
             # Get streaming response (Async)
             response_stream = await self._chat.send_message_stream(user_message)
@@ -254,22 +240,27 @@ class GeminiProvider(AIProvider):
                 # Update usage metadata if available in this chunk (usually final chunk)
                 if chunk.usage_metadata:
                     metadata = chunk.usage_metadata
-                    usage = UsageStats(
-                        tokens_input=metadata.prompt_token_count or 0,
-                        tokens_output=metadata.candidates_token_count or 0,
-                        tokens_total=metadata.total_token_count or 0
+                    self._merge_usage(
+                        metadata.prompt_token_count or 0,
+                        metadata.candidates_token_count or 0,
+                        metadata.total_token_count or 0,
                     )
-                    self.update_session_usage(usage)
             
         except Exception as e:
             error_msg = str(e)
-            if "API_KEY_INVALID" in error_msg or "401" in error_msg:
+            code = _error_code(e)
+            if code == 401 or "API_KEY_INVALID" in error_msg or (code is None and "401" in error_msg):
                 raise ValueError("Invalid API key.")
-            elif "RATE_LIMIT" in error_msg or "429" in error_msg:
+            elif code == 429 or (code is None and ("RATE_LIMIT" in error_msg or "429" in error_msg)):
                 raise RuntimeError("Rate limit exceeded.")
             else:
                 raise RuntimeError(f"Gemini Streaming Error: {error_msg}")
     
+    @property
+    def uses_context_summary(self) -> bool:
+        # The chat session keeps every turn and ignores later system prompts
+        return False
+    
     async def validate_api_key(self) -> bool:
         """
         Validate the API key by making a test request.
@@ -278,18 +269,17 @@ class GeminiProvider(AIProvider):
             True if the key is valid, False otherwise
         """
         try:
-            # Try to list models - this validates the key in the new SDK
-            # Models is a paginated list, we just try to get the first one
-            for _ in self.client.models.list(config={'page_size': 1}):
-                return True
-            return True # If list is empty but no exception, key is likely valid
+            # Fetch a single-entry page of models - this validates the key
+            # without blocking the event loop on the sync pager
+            await self.client.aio.models.list(config={'page_size': 1})
+            return True
         except Exception:
             return False
     
     def get_model_info(self) -> Dict[str, Any]:
         """Get information about the current model."""
         try:
-            model_info = self.client.models.get(model=self._get_api_model_name(self.model))
+            model_info = self.client.models.get(model=self._api_model_name)
             return {
                 "name": model_info.name,
                 "display_name": model_info.display_name,
@@ -5,12 +5,13 @@ Implementation of the AI provider for Groq's models.
 Supports GPT-OSS 120B, Llama 70B Versatile, and Kimi K2.
 """
 
-import asyncio
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
-from groq import Groq
+import httpx
+from groq import AsyncGroq, AuthenticationError, RateLimitError
 
-from .base import AIProvider, AIResponse, Message, UsageStats
+from ._prompt import build_messages, history_dicts
+from .base import AIProvider, AIResponse, Message, UsageStats, cached_send_message
 
 
 class GroqProvider(AIProvider):
@@ -23,12 +24,13 @@ class GroqProvider(AIProvider):
     - moonshotai/Kimi-K2-Instruct (Kimi K2)
     """
     
-    MODELS = [
+    MODELS = (
         "groq/compound",
         "llama-3.3-70b-versatile",
         "openai/gpt-oss-120b",
         "moonshotai/Kimi-K2-Instruct",
-    ]
+    )
+    _MODELS_SET = frozenset(MODELS)
     
     # Display names for UI
     MODEL_DISPLAY_NAMES = {
@@ -40,23 +42,35 @@ class GroqProvider(AIProvider):
     
     def __init__(self, api_key: str, model: str = "llama-3.3-70b-versatile"):
         super().__init__(api_key, model)
-        self._client = Groq(api_key=api_key)
+        # Long-lived pooled connections so follow-up turns skip the TLS handshake
+        self._client = AsyncGroq(
+            api_key=api_key,
+            http_client=httpx.AsyncClient(
+                limits=httpx.Limits(
+                    max_connections=32,
+                    max_keepalive_connections=32,
+                    keepalive_expiry=300,
+                ),
+                timeout=httpx.Timeout(120.0),
+            ),
+        )
     
     @property
     def provider_name(self) -> str:
         return "groq"
     
     @property
-    def available_models(self) -> List[str]:
+    def available_models(self) -> Tuple[str, ...]:
         return self.MODELS
     
     def set_model(self, model: str) -> bool:
         """Change the model being used."""
-        if model in self.available_models:
+        if model in self._MODELS_SET:
             self.model = model
             return True
         return False
     
+    @cached_send_message
     async def send_message(
         self,
         message: str,
@@ -68,44 +82,15 @@ class GroqProvider(AIProvider):
         Send a message to Groq and get a response.
         """
         try:
-            # Build messages list
-            messages = []
+            # Build messages list (system + memories, history, new message)
+            messages = build_messages(message, history_dicts(context), system_prompt, memories)
             
-            # Add system prompt
-            if system_prompt:
-                messages.append({"role": "system", "content": system_prompt})
-            
-            # Add memories
-            if memories:
-                memory_content = (
-                    f"--- MEMORY CONTEXT ---\n"
-                    f"<MEMORIES>\n{memories}\n</MEMORIES>\n"
-                    f"----------------------"
-                )
-                if messages and messages[0]["role"] == "system":
-                    messages[0]["content"] += f"\n\n{memory_content}"
-                else:
-                    messages.insert(0, {"role": "system", "content": memory_content})
-            
-            # Add conversation history
-            if context:
-                for msg in context:
-                    role = "user" if msg.role == "user" else "assistant"
-                    messages.append({"role": role, "content": msg.content})
-            
-            # Add current message
-            messages.append({"role": "user", "content": message})
-            
-            # Make API call in thread pool for async compatibility
-            loop = asyncio.get_event_loop()
-            response = await loop.run_in_executor(
-                None,
-                lambda: self._client.chat.completions.create(
-                    model=self.model,
-                    messages=messages,
-                    temperature=0.7,
-                    max_tokens=8192,
-                )
+            # Make API call
+            response = await self._client.chat.completions.create(
+                model=self.model,
+                messages=messages,
+                temperature=0.7,
+                max_tokens=8192,
             )
             
             # Extract content
@@ -134,9 +119,14 @@ class GroqProvider(AIProvider):
                 raw_response=response,
             )
             
+        except AuthenticationError:
+            raise ValueError("Invalid API key. Please check your Groq API key.")
+        except RateLimitError:
+            raise RuntimeError("Rate limit exceeded. Please wait and try again.")
         except Exception as e:
             error_msg = str(e)
             
+            # Fallback for errors not raised as typed SDK exceptions
             if "401" in error_msg or "invalid_api_key" in error_msg.lower():
                 raise ValueError("Invalid API key. Please check your Groq API key.")
             elif "429" in error_msg or "rate_limit" in error_msg.lower():
@@ -153,50 +143,29 @@ class GroqProvider(AIProvider):
     ):
         """Streaming version of send_message."""
         try:
-            # Build messages list
-            messages = []
-            
-            if system_prompt:
-                messages.append({"role": "system", "content": system_prompt})
-            
-            if memories:
-                memory_content = (
-                    f"--- MEMORY CONTEXT ---\n"
-                    f"<MEMORIES>\n{memories}\n</MEMORIES>\n"
-                    f"----------------------"
-                )
-                if messages and messages[0]["role"] == "system":
-                    messages[0]["content"] += f"\n\n{memory_content}"
-                else:
-                    messages.insert(0, {"role": "system", "content": memory_content})
-            
-            if context:
-                for msg in context:
-                    role = "user" if msg.role == "user" else "assistant"
-                    messages.append({"role": role, "content": msg.content})
-            
-            messages.append({"role": "user", "content": message})
+            # Build messages list (system + memories, history, new message)
+            messages = build_messages(message, history_dicts(context), system_prompt, memories)
             
             # Create streaming response
-            loop = asyncio.get_event_loop()
-            stream = await loop.run_in_executor(
-                None,
-                lambda: self._client.chat.completions.create(
-                    model=self.model,
-                    messages=messages,
-                    temperature=0.7,
-                    max_tokens=8192,
-                    stream=True,
-                )
+            stream = await self._client.chat.completions.create(
+                model=self.model,
+                messages=messages,
+                temperature=0.7,
+                max_tokens=8192,
+                stream=True,
             )
             
             # Yield chunks
-            for chunk in stream:
+            async for chunk in stream:
                 if chunk.choices:
                     delta = chunk.choices[0].delta
                     if delta.content is not None:
                          yield delta.content
                     
+        except AuthenticationError:
+            raise ValueError("Invalid API key.")
+        except RateLimitError:
+            raise RuntimeError("Rate limit exceeded.")
         except Exception as e:
             error_msg = str(e)
             if "401" in error_msg or "invalid_api_key" in error_msg.lower():
@@ -214,11 +183,7 @@ class GroqProvider(AIProvider):
             True if the key is valid, False otherwise
         """
         try:
-            loop = asyncio.get_event_loop()
-            await loop.run_in_executor(
-                None,
-                lambda: self._client.models.list()
-            )
+            await self._client.models.list()
             return True
         except Exception:
             return False
@@ -234,3 +199,7 @@ class GroqProvider(AIProvider):
     def reset_chat(self):
         """Reset any chat state. Groq is stateless so this is a no-op."""
         pass
+    
+    async def close(self):
+        """Close the HTTP client."""
+        await self._client.close()
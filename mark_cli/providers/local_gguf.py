@@ -4,10 +4,83 @@ MARK Local GGUF Provider
 Implementation of AI provider for local GGUF models using llama-cpp-python.
 """
 
+import asyncio
+import os
+import platform
+import shutil
+import sys
+import threading
+import warnings
+from collections import OrderedDict
+from contextlib import suppress
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
-from .base import AIProvider, AIResponse, Message, UsageStats
+from ._prompt import build_messages, build_system, message_dict
+from .base import AIProvider, AIResponse, Message, UsageStats, cached_send_message
+
+
+def _env_int(name: str, default: int) -> int:
+    """Integer from an environment variable, warning and falling back on bad values."""
+    value = os.environ.get(name)
+    if value is None:
+        return default
+    try:
+        return int(value)
+    except ValueError:
+        warnings.warn(f"Ignoring {name}={value!r}: not an integer", RuntimeWarning, stacklevel=2)
+        return default
+
+
+# RAM budget for cached prompt KV states (llama-cpp-python's default is 2 GiB)
+PROMPT_CACHE_BYTES = _env_int("MARK_LLAMA_CACHE_BYTES", 2 << 30)
+
+# Context window and completion budget for local models
+N_CTX = 8192
+MAX_TOKENS = 2048
+
+# Loaded models kept in memory, so switching back to one skips the reload
+MODEL_POOL_SIZE = 2
+
+# Marks the end of a stream produced by the worker thread
+_STREAM_END = object()
+
+
+def _usable_cpu_count() -> int:
+    """CPUs this process may run on (respects affinity masks where supported)."""
+    if hasattr(os, "sched_getaffinity"):
+        return len(os.sched_getaffinity(0))
+    return os.cpu_count() or 1
+
+
+def _missing_accelerations() -> List[str]:
+    """
+    Hardware features this machine has but the loaded llama.cpp build lacks.
+    
+    Generic pip wheels are often built without AVX2/FMA or GPU offload,
+    which can make inference several times slower than a native build.
+    """
+    import llama_cpp
+    
+    info = llama_cpp.llama_print_system_info()
+    if isinstance(info, bytes):
+        info = info.decode("utf-8", "replace")
+    # "AVX = 1 | AVX2 = 0 | ..." (newer builds prefix backends, e.g. "CPU : ")
+    flags = {}
+    for field in info.split("|"):
+        name, _, value = field.rpartition("=")
+        if name:
+            flags[name.split(":")[-1].strip()] = value.strip()
+    
+    missing = []
+    if platform.machine().lower() in ("x86_64", "amd64"):
+        missing += [f for f in ("AVX2", "FMA") if flags.get(f) == "0"]
+    if not llama_cpp.llama_supports_gpu_offload():
+        if sys.platform == "darwin" and platform.machine() == "arm64":
+            missing.append("Metal")
+        elif shutil.which("nvidia-smi"):
+            missing.append("CUDA")
+    return missing
 
 
 class LocalGGUFProvider(AIProvider):
@@ -17,40 +90,112 @@ class LocalGGUFProvider(AIProvider):
     Loads .gguf files directly and runs inference locally.
     """
     
-    def __init__(self, api_key: str = "", model: str = ""):
+    # Loaded Llama instances by model path, least recently used first
+    _POOL: "OrderedDict[str, Any]" = OrderedDict()
+    
+    def __init__(
+        self,
+        api_key: str = "",
+        model: str = "",
+        n_gpu_layers: Optional[int] = None,
+        n_batch: int = 2048,
+        n_ubatch: int = 512,
+        n_threads: Optional[int] = None,
+        flash_attn: Optional[bool] = None,
+    ):
         """
         Initialize the local provider.
         
         Args:
             api_key: Ignored (not needed for local models)
             model: Path to the .gguf file (absolute or relative to models dir)
+            n_gpu_layers: Layers to offload to the GPU (-1 = all).
+                Defaults to MARK_N_GPU_LAYERS or -1.
+            n_batch: Prompt processing batch size
+            n_ubatch: Physical micro-batch size
+            n_threads: CPU threads for inference.
+                Defaults to MARK_LLAMA_THREADS or the usable CPU count.
+            flash_attn: Use flash attention (GPU builds only).
+                Defaults to MARK_LLAMA_FLASH_ATTN=1, otherwise off.
         """
         super().__init__(api_key="local", model=model)
         self._llm = None
         self._model_path = model
+        # History entries by id(Message): (message, API dict, token count)
+        self._history_cache: Dict[int, Tuple[Message, Dict[str, str], int]] = {}
+        
+        if n_gpu_layers is None:
+            n_gpu_layers = _env_int("MARK_N_GPU_LAYERS", -1)
+        if n_threads is None:
+            n_threads = _env_int("MARK_LLAMA_THREADS", 0) or _usable_cpu_count()
+        if flash_attn is None:
+            flash_attn = os.environ.get("MARK_LLAMA_FLASH_ATTN", "0") == "1"
+        self._n_gpu_layers = n_gpu_layers
+        self._n_batch = n_batch
+        self._n_ubatch = n_ubatch
+        self._n_threads = n_threads
+        # Only meaningful when layers are offloaded to a GPU
+        self._flash_attn = flash_attn and n_gpu_layers != 0
         
         # Lazy load the model on first use
     
     def _ensure_loaded(self):
-        """Load the model if not already loaded."""
-        if self._llm is None:
-            try:
-                from llama_cpp import Llama
-            except ImportError:
-                raise ImportError(
-                    "llama-cpp-python is not installed. "
-                    "Install it with: pip install llama-cpp-python"
-                )
-            
-            if not Path(self._model_path).exists():
-                raise FileNotFoundError(f"Model file not found: {self._model_path}")
-            
-            self._llm = Llama(
-                model_path=str(self._model_path),
-                n_ctx=8192,
-                n_threads=None,  # Auto-detect
-                verbose=False,
+        """Load the model if not already loaded, reusing a pooled instance."""
+        if self._llm is not None:
+            return
+        pool = LocalGGUFProvider._POOL
+        key = str(self._model_path)
+        if key in pool:
+            pool.move_to_end(key)
+            self._llm = pool[key]
+            return
+        try:
+            from llama_cpp import Llama, LlamaRAMCache
+        except ImportError:
+            raise ImportError(
+                "llama-cpp-python is not installed. "
+                "Install it with: pip install llama-cpp-python"
             )
+        
+        if not Path(self._model_path).exists():
+            raise FileNotFoundError(f"Model file not found: {self._model_path}")
+        
+        self._llm = Llama(
+            model_path=str(self._model_path),
+            n_ctx=N_CTX,
+            n_threads=self._n_threads,
+            n_gpu_layers=self._n_gpu_layers,  # Ignored on CPU-only builds
+            n_batch=self._n_batch,
+            n_ubatch=self._n_ubatch,
+            use_mmap=True,
+            use_mlock=False,
+            offload_kqv=True,
+            flash_attn=self._flash_attn,
+            verbose=False,
+        )
+        # Keep KV states of earlier prompts: before each completion the
+        # state with the longest common token prefix is restored, so a
+        # shared system/memory prefix (or the previous turn) is not
+        # prefilled again. Set MARK_LLAMA_CACHE_BYTES=0 to disable.
+        if PROMPT_CACHE_BYTES > 0:
+            self._llm.set_cache(LlamaRAMCache(capacity_bytes=PROMPT_CACHE_BYTES))
+        
+        with suppress(Exception):
+            missing = _missing_accelerations()
+            if missing:
+                warnings.warn(
+                    f"llama-cpp-python was built without {', '.join(missing)}; "
+                    "local inference will be slow. Rebuild it with "
+                    "scripts/install_llama.sh",
+                    RuntimeWarning,
+                    stacklevel=2,
+                )
+        
+        pool[key] = self._llm
+        # Only drop the pool's reference: another provider instance may still
+        # be using the evicted model, which is freed once nothing holds it
+        while len(pool) > MODEL_POOL_SIZE:
+            pool.popitem(last=False)
     
     @property
     def provider_name(self) -> str:
@@ -62,11 +207,18 @@ class LocalGGUFProvider(AIProvider):
         # Return empty list; actual discovery happens in main.py
         return []
     
+    @property
+    def uses_context_summary(self) -> bool:
+        # An extra completion would replace the cached prompt prefix;
+        # history is trimmed to the token budget instead
+        return False
+    
     def set_model(self, model: str) -> bool:
-        """Change the model (requires reloading)."""
+        """Change the model (pooled models are reused without reloading)."""
         if Path(model).exists():
             self._model_path = model
-            self._llm = None  # Force reload
+            self._llm = None  # Picked up from the pool or loaded on next use
+            self._history_cache = {}  # Token counts depend on the model
             self.model = model
             return True
         return False
@@ -78,40 +230,46 @@ class LocalGGUFProvider(AIProvider):
         system_prompt: Optional[str] = None,
         memories: Optional[str] = None,
     ) -> List[Dict[str, str]]:
-        """Build OpenAI-compatible messages list."""
-        messages = []
-        
-        # System prompt
-        if system_prompt:
-            sys_content = system_prompt
-            if memories:
-                sys_content += (
-                    f"\n\n--- MEMORY CONTEXT ---\n"
-                    f"<MEMORIES>\n{memories}\n</MEMORIES>\n"
-                    f"----------------------"
-                )
-            messages.append({"role": "system", "content": sys_content})
-        elif memories:
-            messages.append({
-                "role": "system",
-                "content": (
-                    f"--- MEMORY CONTEXT ---\n"
-                    f"<MEMORIES>\n{memories}\n</MEMORIES>\n"
-                    f"----------------------"
-                )
-            })
-        
-        # Conversation history
+        """Build OpenAI-compatible messages list, trimming history to fit the window."""
+        history = []
         if context:
-            for msg in context:
-                role = "user" if msg.role == "user" else "assistant"
-                messages.append({"role": role, "content": msg.content})
+            budget = N_CTX - MAX_TOKENS - self._count_tokens(message)
+            system_content = build_system(system_prompt, memories)
+            if system_content:
+                budget -= self._count_tokens(system_content)
+            history = self._history_messages(context, budget)
         
-        # Current message
-        messages.append({"role": "user", "content": message})
+        return build_messages(message, history, system_prompt, memories)
+    
+    def _count_tokens(self, text: str) -> int:
+        """Number of model tokens in text."""
+        return len(self._llm.tokenize(text.encode("utf-8"), add_bos=False))
+    
+    def _history_messages(self, context: List[Message], budget: int) -> List[Dict[str, str]]:
+        """
+        Convert history to API dicts, reusing entries from earlier turns.
+        
+        Each message is converted and tokenized once; the oldest messages
+        are dropped while the history exceeds the token budget.
+        """
+        cache = self._history_cache
+        entries = []
+        for msg in context:
+            entry = cache.get(id(msg))
+            if entry is None or entry[0] is not msg:
+                entry = (msg, message_dict(msg), self._count_tokens(msg.content))
+            entries.append(entry)
+        # Keep only live messages so evicted history can be freed
+        self._history_cache = {id(entry[0]): entry for entry in entries}
         
-        return messages
+        total = sum(entry[2] for entry in entries)
+        start = 0
+        while start < len(entries) and total > budget:
+            total -= entries[start][2]
+            start += 1
+        return [entry[1] for entry in entries[start:]]
     
+    @cached_send_message
     async def send_message(
         self,
         message: str,
@@ -127,7 +285,7 @@ class LocalGGUFProvider(AIProvider):
         try:
             response = self._llm.create_chat_completion(
                 messages=messages,
-                max_tokens=2048,
+                max_tokens=MAX_TOKENS,
                 temperature=0.7,
                 stream=False,
             )
@@ -165,21 +323,47 @@ class LocalGGUFProvider(AIProvider):
         
         messages = self._build_messages(message, context, system_prompt, memories)
         
+        # Token generation blocks, so it runs in a worker thread that hands
+        # chunks to the event loop; the UI keeps refreshing and Ctrl+C is
+        # handled between tokens.
+        loop = asyncio.get_running_loop()
+        queue: asyncio.Queue = asyncio.Queue()
+        stop = threading.Event()
+        
+        def produce():
+            try:
+                stream = self._llm.create_chat_completion(
+                    messages=messages,
+                    max_tokens=MAX_TOKENS,
+                    temperature=0.7,
+                    stream=True,
+                )
+                for chunk in stream:
+                    if stop.is_set():
+                        break
+                    content = chunk["choices"][0].get("delta", {}).get("content")
+                    if content:
+                        loop.call_soon_threadsafe(queue.put_nowait, content)
+                item = _STREAM_END
+            except Exception as e:
+                item = e
+            loop.call_soon_threadsafe(queue.put_nowait, item)
+        
+        worker = loop.run_in_executor(None, produce)
         try:
-            stream = self._llm.create_chat_completion(
-                messages=messages,
-                max_tokens=2048,
-                temperature=0.7,
-                stream=True,
-            )
-            
-            for chunk in stream:
-                delta = chunk["choices"][0].get("delta", {})
-                if "content" in delta and delta["content"]:
-                    yield delta["content"]
-                    
-        except Exception as e:
-            raise RuntimeError(f"Local Model Streaming Error: {e}")
+            while True:
+                item = await queue.get()
+                if item is _STREAM_END:
+                    break
+                if isinstance(item, Exception):
+                    raise RuntimeError(f"Local Model Streaming Error: {item}")
+                yield item
+        finally:
+            # The model is not thread-safe: let the worker finish before the
+            # next request can use it
+            stop.set()
+            with suppress(Exception):
+                await worker
     
     async def validate_api_key(self) -> bool:
         """Local models don't need API key validation."""
@@ -204,5 +388,6 @@ class LocalGGUFProvider(AIProvider):
     def unload(self):
         """Unload the model to free memory."""
         if self._llm is not None:
+            LocalGGUFProvider._POOL.pop(str(self._model_path), None)
             del self._llm
             self._llm = None
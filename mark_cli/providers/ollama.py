@@ -6,11 +6,55 @@ Ollama exposes an OpenAI-compatible API at localhost:11434.
 """
 
 import json
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
 import httpx
 
-from .base import AIProvider, AIResponse, Message, UsageStats
+from ._prompt import build_messages, message_dict
+from .base import AIProvider, AIResponse, Message, UsageStats, cached_send_message
+
+try:
+    # Optional C JSON codec for request bodies and the per-token NDJSON lines
+    from orjson import dumps as _json_dumps, loads as _json_loads
+except ImportError:
+    _json_loads = json.loads
+
+    def _json_dumps(obj: Any) -> bytes:
+        return json.dumps(obj).encode()
+
+
+# Request bodies are pre-encoded bytes, so the content type is set explicitly
+_JSON_HEADERS = {"Content-Type": "application/json"}
+
+# Read size for streamed responses
+STREAM_CHUNK_SIZE = 65536
+
+# One pooled client shared by every OllamaProvider instance
+_SHARED_CLIENT: Optional[httpx.AsyncClient] = None
+# Providers holding the shared client; it is closed when the last one releases it
+_CLIENT_USERS = 0
+
+
+def _get_client() -> httpx.AsyncClient:
+    """Return the shared keep-alive client, creating it on first use."""
+    global _SHARED_CLIENT
+    if _SHARED_CLIENT is None or _SHARED_CLIENT.is_closed:
+        _SHARED_CLIENT = httpx.AsyncClient(
+            timeout=httpx.Timeout(120.0, connect=5.0),
+            limits=httpx.Limits(max_keepalive_connections=16, keepalive_expiry=300),
+        )
+    return _SHARED_CLIENT
+
+
+def _frame_content(frame: bytes) -> str:
+    """Extract the message text from one NDJSON frame ("" for blank or invalid frames)."""
+    if not frame.strip():
+        return ""
+    try:
+        data = _json_loads(frame)
+    except ValueError:  # json/orjson JSONDecodeError
+        return ""
+    return data.get("message", {}).get("content", "")
 
 
 class OllamaProvider(AIProvider):
@@ -33,7 +77,17 @@ class OllamaProvider(AIProvider):
         """
         super().__init__(api_key="local", model=model)
         self._endpoint = self.DEFAULT_ENDPOINT
-        self._client = httpx.AsyncClient(timeout=120.0)
+        # History entries by id(Message): (message, API dict)
+        self._history_cache: Dict[int, Tuple[Message, Dict[str, str]]] = {}
+        self._holds_client = False
+    
+    @property
+    def _client(self) -> httpx.AsyncClient:
+        global _CLIENT_USERS
+        if not self._holds_client:
+            self._holds_client = True
+            _CLIENT_USERS += 1
+        return _get_client()
     
     @property
     def provider_name(self) -> str:
@@ -60,47 +114,24 @@ class OllamaProvider(AIProvider):
             pass
         return []
     
-    def _build_messages(
-        self,
-        message: str,
-        context: Optional[List[Message]] = None,
-        system_prompt: Optional[str] = None,
-        memories: Optional[str] = None,
-    ) -> List[Dict[str, str]]:
-        """Build messages list for Ollama API."""
-        messages = []
-        
-        # System prompt
-        if system_prompt:
-            sys_content = system_prompt
-            if memories:
-                sys_content += (
-                    f"\n\n--- MEMORY CONTEXT ---\n"
-                    f"<MEMORIES>\n{memories}\n</MEMORIES>\n"
-                    f"----------------------"
-                )
-            messages.append({"role": "system", "content": sys_content})
-        elif memories:
-            messages.append({
-                "role": "system",
-                "content": (
-                    f"--- MEMORY CONTEXT ---\n"
-                    f"<MEMORIES>\n{memories}\n</MEMORIES>\n"
-                    f"----------------------"
-                )
-            })
-        
-        # Conversation history
-        if context:
-            for msg in context:
-                role = "user" if msg.role == "user" else "assistant"
-                messages.append({"role": role, "content": msg.content})
-        
-        # Current message
-        messages.append({"role": "user", "content": message})
+    def _history_messages(self, context: Optional[List[Message]]) -> List[Dict[str, str]]:
+        """
+        Convert history to API dicts, reusing the dicts built on earlier turns.
         
-        return messages
+        Ollama truncates to the model's num_ctx itself, so nothing is trimmed here.
+        """
+        cache = self._history_cache
+        entries = []
+        for msg in context or ():
+            entry = cache.get(id(msg))
+            if entry is None or entry[0] is not msg:
+                entry = (msg, message_dict(msg))
+            entries.append(entry)
+        # Keep only live messages so evicted history can be freed
+        self._history_cache = {id(entry[0]): entry for entry in entries}
+        return [entry[1] for entry in entries]
     
+    @cached_send_message
     async def send_message(
         self,
         message: str,
@@ -109,16 +140,17 @@ class OllamaProvider(AIProvider):
         memories: Optional[str] = None,
     ) -> AIResponse:
         """Send a message and get a response (non-streaming)."""
-        messages = self._build_messages(message, context, system_prompt, memories)
+        messages = build_messages(message, self._history_messages(context), system_prompt, memories)
         
         try:
             response = await self._client.post(
                 f"{self._endpoint}/api/chat",
-                json={
+                content=_json_dumps({
                     "model": self.model,
                     "messages": messages,
                     "stream": False,
-                },
+                }),
+                headers=_JSON_HEADERS,
             )
             
             if response.status_code != 200:
@@ -159,31 +191,38 @@ class OllamaProvider(AIProvider):
         memories: Optional[str] = None,
     ):
         """Stream a message response."""
-        messages = self._build_messages(message, context, system_prompt, memories)
+        messages = build_messages(message, self._history_messages(context), system_prompt, memories)
         
         try:
             async with self._client.stream(
                 "POST",
                 f"{self._endpoint}/api/chat",
-                json={
+                content=_json_dumps({
                     "model": self.model,
                     "messages": messages,
                     "stream": True,
-                },
+                }),
+                headers=_JSON_HEADERS,
             ) as response:
                 if response.status_code != 200:
                     error_text = await response.aread()
                     raise RuntimeError(f"Ollama error: {error_text.decode()}")
                 
-                async for line in response.aiter_lines():
-                    if line:
-                        try:
-                            data = json.loads(line)
-                            content = data.get("message", {}).get("content", "")
-                            if content:
-                                yield content
-                        except json.JSONDecodeError:
-                            continue
+                # NDJSON framing on raw bytes: no per-line str decode
+                buffer = bytearray()
+                async for chunk in response.aiter_bytes(STREAM_CHUNK_SIZE):
+                    buffer += chunk
+                    while (newline := buffer.find(b"\n")) != -1:
+                        frame = bytes(buffer[:newline])
+                        del buffer[:newline + 1]
+                        content = _frame_content(frame)
+                        if content:
+                            yield content
+                
+                # Last frame may arrive without a trailing newline
+                content = _frame_content(bytes(buffer))
+                if content:
+                    yield content
                             
         except httpx.ConnectError:
             raise RuntimeError(
@@ -216,5 +255,12 @@ class OllamaProvider(AIProvider):
         pass
     
     async def close(self):
-        """Close the HTTP client."""
-        await self._client.aclose()
+        """Release the shared HTTP client, closing it once no provider uses it."""
+        global _SHARED_CLIENT, _CLIENT_USERS
+        if not self._holds_client:
+            return
+        self._holds_client = False
+        _CLIENT_USERS -= 1
+        if _CLIENT_USERS == 0 and _SHARED_CLIENT is not None:
+            await _SHARED_CLIENT.aclose()
+            _SHARED_CLIENT = None
@@ -4,17 +4,12 @@ MARK UI Components
 Reusable Rich components for the terminal interface.
 """
 
-from datetime import datetime
 from typing import Any, Dict, List, Optional
 
-from rich.console import Console, RenderableType
-from rich.layout import Layout
-from rich.live import Live
+from rich import box
 from rich.markdown import Markdown
 from rich.panel import Panel
-from rich.progress import Progress, SpinnerColumn, TextColumn
 from rich.style import Style
-from rich.syntax import Syntax
 from rich.table import Table
 from rich.text import Text
 
@@ -134,10 +129,44 @@ THEMES = {
 # Default to "red" theme
 COLORS = THEMES["red"].copy()
 
+_BOLD = Style(bold=True)
+_ITALIC = Style(italic=True)
+
+# Parsed Style objects by (color role, bold) for the active theme
+_style_cache: Dict[Any, Style] = {}
+
+
+def _sty(name: str, bold: bool = False) -> Style:
+    """Return the cached Style for a COLORS role so Rich skips re-parsing it."""
+    key = (name, bold)
+    style = _style_cache.get(key)
+    if style is None:
+        style = Style(color=COLORS[name], bold=bold or None)
+        _style_cache[key] = style
+    return style
+
+
+def _head(text: str, limit: int) -> str:
+    """First limit characters of text (returned as-is when it already fits)."""
+    return text if len(text) <= limit else text[:limit]
+
+
+def _clip(text: str, limit: int) -> str:
+    """Like _head, but marks truncated text with "..."."""
+    return text if len(text) <= limit else text[:limit] + "..."
+
+
 def apply_theme(theme_name: str):
     """Update the global COLORS dictionary with the selected theme."""
+    # Imported here: performance.py imports this module
+    from .performance import PerformancePanel
+    
     if theme_name in THEMES:
         COLORS.update(THEMES[theme_name])
+        _style_cache.clear()
+        HelpTable._cache = None
+        FooterBar._cache = None
+        PerformancePanel._cache = None
         return True
     return False
 
@@ -163,18 +192,17 @@ class HeaderPanel:
         """Render the header panel."""
         # Build status indicator
         status_icon = "●" if self.connected else "○"
-        status_color = COLORS["success"] if self.connected else COLORS["error"]
+        status_color = _sty("success") if self.connected else _sty("error")
         status_text = "Connected" if self.connected else "Disconnected"
         
-        # Create header text
-        header = Text()
-        header.append("MARK", style=f"bold {COLORS['primary']}")
-        header.append(" | ", style=COLORS["muted"])
-        header.append(f"{self.provider.upper()}", style=f"bold {COLORS['secondary']}")
-        header.append(f" [{self.model}]", style=COLORS["muted"])
-        header.append(" | ", style=COLORS["muted"])
-        header.append(f"{status_icon} ", style=status_color)
-        header.append(status_text, style=status_color)
+        # Create header text (one span per style run)
+        header = Text.assemble(
+            ("MARK", _sty("primary", bold=True)),
+            (" | ", _sty("muted")),
+            (self.provider.upper(), _sty("secondary", bold=True)),
+            (f" [{self.model}] | ", _sty("muted")),
+            (f"{status_icon} {status_text}", status_color),
+        )
         
         return Panel(
             header,
@@ -213,34 +241,28 @@ class UsagePanel:
     
     def render(self) -> Panel:
         """Render the usage panel."""
-        content = Text()
-        
-        # Title
-        content.append("USAGE\n", style=f"bold {COLORS['info']}")
-        
         # Tokens
         tokens_pct = (self.tokens_used / self.tokens_limit * 100) if self.tokens_limit > 0 else 0
-        tokens_color = COLORS["success"] if tokens_pct < 80 else (COLORS["warning"] if tokens_pct < 95 else COLORS["error"])
-        
-        content.append("├─ ", style=COLORS["muted"])
-        content.append("Token: ", style="bold")
-        content.append(f"{self.tokens_used:,}", style=tokens_color)
-        content.append(f" / {self.tokens_limit:,}\n", style=COLORS["muted"])
-        
-        # Requests
-        content.append("├─ ", style=COLORS["muted"])
-        content.append("Requests: ", style="bold")
-        content.append(f"{self.requests_count}\n", style=COLORS["info"])
+        tokens_color = _sty("success") if tokens_pct < 80 else (_sty("warning") if tokens_pct < 95 else _sty("error"))
         
         # Rate limit
         rate_icon = "✓" if self.rate_limit_ok else "⚠"
-        rate_color = COLORS["success"] if self.rate_limit_ok else COLORS["warning"]
+        rate_color = _sty("success") if self.rate_limit_ok else _sty("warning")
         rate_text = "OK" if self.rate_limit_ok else "Limited"
         
-        content.append("└─ ", style=COLORS["muted"])
-        content.append("Rate Limit: ", style="bold")
-        content.append(f"{rate_icon} ", style=rate_color)
-        content.append(rate_text, style=rate_color)
+        # One span per style run
+        content = Text.assemble(
+            ("USAGE\n", _sty("info", bold=True)),
+            ("├─ ", _sty("muted")),
+            ("Token: ", _BOLD),
+            (f"{self.tokens_used:,}", tokens_color),
+            (f" / {self.tokens_limit:,}\n├─ ", _sty("muted")),
+            ("Requests: ", _BOLD),
+            (f"{self.requests_count}\n", _sty("info")),
+            ("└─ ", _sty("muted")),
+            ("Rate Limit: ", _BOLD),
+            (f"{rate_icon} {rate_text}", rate_color),
+        )
         
         return Panel(
             content,
@@ -274,9 +296,8 @@ class MessagePanel:
     @staticmethod
     def user_message(content: str, user_name: str = "User", timestamp: Optional[str] = None) -> Panel:
         """Render a user message."""
-        from rich import box
         text = Text()
-        text.append(f"{user_name}", style=f"bold {COLORS['user']}")
+        text.append(f"{user_name}", style=_sty("user", bold=True))
         
         if timestamp:
             text.append(f" | {timestamp}", style=COLORS["muted"])
@@ -293,8 +314,6 @@ class MessagePanel:
     @staticmethod
     def ai_message(content: Any, model: str = "", timestamp: Optional[str] = None, style: str = "ai", is_streaming: bool = False) -> Panel:
         """Render an AI response message with markdown support or direct renderable."""
-        from rich import box
-        from rich.markdown import Markdown
         title = Text()
         
         if style == "kleos":
@@ -302,8 +321,7 @@ class MessagePanel:
         else:
             display_name = "MARK" if style == "ai" else style.upper()
             
-        color = COLORS.get(style, COLORS["ai"])
-        title.append(display_name, style=f"bold {color}")
+        title.append(display_name, style=_sty(style if style in COLORS else "ai", bold=True))
         
         if model:
             title.append(f" [{model}]", style=COLORS["muted"])
@@ -311,8 +329,14 @@ class MessagePanel:
         if timestamp:
             title.append(f" | {timestamp}", style=COLORS["muted"])
         
-        # Always treat as Markdown for consistency unless it's already a renderable
-        renderable = Markdown(content) if isinstance(content, str) else content
+        # Strings are Markdown, except while streaming: plain text keeps each
+        # frame cheap and the Markdown is parsed once for the final render
+        if not isinstance(content, str):
+            renderable = content
+        elif is_streaming:
+            renderable = Text(content)
+        else:
+            renderable = Markdown(content)
         
         return Panel(
             renderable,
@@ -399,17 +423,23 @@ class HelpTable:
         ("Ctrl+C", "Stop AI response"),
     ]
     
+    # Rendered panel for the active theme (reset by apply_theme)
+    _cache: Optional[Panel] = None
+    
     @classmethod
     def render(cls) -> Panel:
         """Render the help table."""
+        if cls._cache is not None:
+            return cls._cache
+        
         table = Table(
             show_header=True,
-            header_style=f"bold {COLORS['primary']}",
+            header_style=_sty("primary", bold=True),
             border_style=COLORS["border"],
             padding=(0, 1),
         )
         
-        table.add_column("Command", style=f"bold {COLORS['info']}")
+        table.add_column("Command", style=_sty("info", bold=True))
         table.add_column("Description")
         
         for cmd, desc in cls.COMMANDS:
@@ -423,13 +453,14 @@ class HelpTable:
             style=COLORS["secondary"]
         )
         
-        return Panel(
+        cls._cache = Panel(
             table,
             title="AVAILABLE COMMANDS",
             title_align="left",
             border_style=COLORS["primary"],
             padding=(0, 1),
         )
+        return cls._cache
 
 
 # =============================================================================
@@ -440,6 +471,9 @@ class LoadingSpinner:
     """Animated loading spinner."""
     
     def __init__(self, message: str = "Processing..."):
+        # Progress is only needed here, keep it out of the import-time path
+        from rich.progress import Progress, SpinnerColumn, TextColumn
+        
         self.message = message
         self.progress = Progress(
             SpinnerColumn("dots"),
@@ -481,20 +515,27 @@ class LoadingSpinner:
 class FooterBar:
     """Footer showing keyboard shortcuts."""
     
-    @staticmethod  
-    def render() -> Text:
-        """Render the footer bar."""
+    # Rendered footer, rebuilt after a theme change
+    _cache: Optional[Text] = None
+    
+    @classmethod
+    def render(cls) -> Text:
+        """Render the footer bar (a copy, so callers can't alter the cached one)."""
+        if cls._cache is not None:
+            return cls._cache.copy()
+        
         footer = Text()
-        footer.append("  /help", style=f"bold {COLORS['info']}")
+        footer.append("  /help", style=_sty("info", bold=True))
         footer.append(" help", style=COLORS["muted"])
         footer.append("  │  ", style=COLORS["border"])
-        footer.append("/ts", style=f"bold {COLORS['warning']}")
+        footer.append("/ts", style=_sty("warning", bold=True))
         footer.append(" stats", style=COLORS["muted"])
         footer.append("  │  ", style=COLORS["border"])
-        footer.append("/quit", style=f"bold {COLORS['error']}")
+        footer.append("/quit", style=_sty("error", bold=True))
         footer.append(" exit", style=COLORS["muted"])
         
-        return footer
+        cls._cache = footer
+        return footer.copy()
 
 
 # =============================================================================
@@ -517,12 +558,12 @@ class MemoryList:
         
         table = Table(
             show_header=True,
-            header_style=f"bold {COLORS['secondary']}",
+            header_style=_sty("secondary", bold=True),
             border_style=COLORS["border"],
         )
         
         table.add_column("ID", style=COLORS["muted"], width=4)
-        table.add_column("Key", style=f"bold {COLORS['info']}", width=15)
+        table.add_column("Key", style=_sty("info", bold=True), width=15)
         table.add_column("Value", ratio=1)
         table.add_column("Date", style=COLORS["muted"], width=10)
         
@@ -530,8 +571,8 @@ class MemoryList:
             table.add_row(
                 str(mem.get("id", "")),
                 mem.get("key", ""),
-                mem.get("value", "")[:50] + ("..." if len(mem.get("value", "")) > 50 else ""),
-                str(mem.get("timestamp", ""))[:10],
+                _clip(mem.get("value") or "", 50),
+                _head(str(mem.get("timestamp", "")), 10),
             )
         
         return Panel(
@@ -563,27 +604,31 @@ class StatsPanel:
             padding=(0, 1),
         )
         
-        table.add_column("Stat", style=f"bold {COLORS['muted']}")
+        table.add_column("Stat", style=_sty("muted", bold=True))
         table.add_column("Value", style=COLORS["info"])
         
-        # Session stats
-        table.add_row("CURRENT SESSION", "", style=f"bold {COLORS['primary']}")
-        table.add_row("  Token Input", f"{session_stats.get('tokens_input', 0):,}")
-        table.add_row("  Token Output", f"{session_stats.get('tokens_output', 0):,}")
-        table.add_row("  Total Tokens", f"{session_stats.get('tokens_total', 0):,}")
-        table.add_row("  Requests", str(session_stats.get('requests_count', 0)))
-        table.add_row("", "")
-        
-        # DB stats (last 30 days)
-        table.add_row("LAST 30 DAYS", "", style=f"bold {COLORS['secondary']}")
-        table.add_row("  Total Requests", str(db_stats.get('request_count', 0)))
-        table.add_row("  Total Tokens", f"{db_stats.get('total_tokens', 0):,}")
-        table.add_row("", "")
-        
-        # Provider info
-        table.add_row("PROVIDER", "", style=f"bold {COLORS['info']}")
-        table.add_row("  Name", provider.upper())
-        table.add_row("  Model", model)
+        session = session_stats.get
+        db = db_stats.get
+        rows = (
+            # Session stats
+            ("CURRENT SESSION", "", _sty("primary", bold=True)),
+            ("  Token Input", f"{session('tokens_input', 0):,}", None),
+            ("  Token Output", f"{session('tokens_output', 0):,}", None),
+            ("  Total Tokens", f"{session('tokens_total', 0):,}", None),
+            ("  Requests", str(session('requests_count', 0)), None),
+            ("", "", None),
+            # DB stats (last 30 days)
+            ("LAST 30 DAYS", "", _sty("secondary", bold=True)),
+            ("  Total Requests", str(db('request_count', 0)), None),
+            ("  Total Tokens", f"{db('total_tokens', 0):,}", None),
+            ("", "", None),
+            # Provider info
+            ("PROVIDER", "", _sty("info", bold=True)),
+            ("  Name", provider.upper(), None),
+            ("  Model", model, None),
+        )
+        for label, value, row_style in rows:
+            table.add_row(label, value, style=row_style)
         
         return Panel(
             table,
@@ -5,14 +5,21 @@ The primary Rich-based terminal interface for MARK.
 """
 
 import asyncio
+import itertools
 import random
-from typing import Any, Callable, Dict, List, Optional
+from collections import deque
+from functools import lru_cache, partial
+from statistics import median
+from time import perf_counter
+from typing import Any, Callable, Deque, Dict, List, Optional
 
+from rich import box
 from rich.console import Console
 from rich.layout import Layout
 from rich.live import Live
 from rich.panel import Panel
 from rich.prompt import Prompt
+from rich.style import Style
 from rich.text import Text
 
 from .components import (
@@ -25,10 +32,55 @@ from .components import (
     MemoryList,
     MessagePanel,
     StatsPanel,
-    UsagePanel
+    UsagePanel,
+    _ITALIC,
+    _sty,
 )
 from .performance import PerformancePanel
-from ..config import SPLASH_MESSAGES
+from ..config import SPLASH_MESSAGES, UI_MESSAGES
+
+# Welcome banner logo, primary color for the first three lines
+_LOGO_LINES = (
+    "  ███╗   ███╗ █████╗ ██████╗ ██╗  ██╗\n",
+    "  ████╗ ████║██╔══██╗██╔══██╗██║ ██╔╝\n",
+    "  ██╔████╔██║███████║██████╔╝█████╔╝ \n",
+    "  ██║╚██╔╝██║██╔══██║██╔══██╗██╔═██╗ \n",
+    "  ██║ ╚═╝ ██║██║  ██║██║  ██║██║  ██╗\n",
+    "  ╚═╝     ╚═╝╚═╝  ╚═╝╚═╝  ╚═╝╚═╝  ╚═╝\n",
+)
+
+
+def _never() -> bool:
+    """Stand-in for Event.is_set when there is no cancel event."""
+    return False
+
+
+@lru_cache(maxsize=256)
+def _loader_text(frame: str, elapsed: int) -> Text:
+    """
+    Thinking loader line; every thinking phase counts up from 0s, so later ones hit the cache.
+    
+    The Text is shared between calls: copy it before modifying.
+    """
+    loader_text = Text()
+    # Yellow loader icon (always yellow for brand consistency)
+    loader_text.append(f"{frame} ", style="bold #fde047")
+    # Force English for fixed UI elements per user request
+    loader_text.append(f"Thinking for {elapsed}s", style="italic")
+    return loader_text
+
+
+@lru_cache(maxsize=8)
+def _styled_prompt(prompt_text: str, style: Style) -> Text:
+    """
+    Input prompt Text; cached per style so a theme change builds a new one.
+    
+    The Text is shared between calls: copy it before modifying.
+    """
+    styled_prompt = Text()
+    styled_prompt.append("  ", style="")
+    styled_prompt.append(prompt_text, style=style)
+    return styled_prompt
 
 
 class MarkInterface:
@@ -43,6 +95,9 @@ class MarkInterface:
     - Error handling display
     """
     
+    # Welcome logo for the current theme: (colors, Text)
+    _logo: Optional[tuple] = None
+    
     def __init__(self, console: Optional[Console] = None):
         """
         Initialize the interface.
@@ -68,30 +123,31 @@ class MarkInterface:
         """Print the welcome banner."""
         self.clear()
         
-        banner = Text()
-        banner.append("\n")
-        banner.append("  ███╗   ███╗ █████╗ ██████╗ ██╗  ██╗\n", style=f"bold {COLORS['primary']}")
-        banner.append("  ████╗ ████║██╔══██╗██╔══██╗██║ ██╔╝\n", style=f"bold {COLORS['primary']}")
-        banner.append("  ██╔████╔██║███████║██████╔╝█████╔╝ \n", style=f"bold {COLORS['primary']}")
-        banner.append("  ██║╚██╔╝██║██╔══██║██╔══██╗██╔═██╗ \n", style=f"bold {COLORS['secondary']}")
-        banner.append("  ██║ ╚═╝ ██║██║  ██║██║  ██║██║  ██╗\n", style=f"bold {COLORS['secondary']}")
-        banner.append("  ╚═╝     ╚═╝╚═╝  ╚═╝╚═╝  ╚═╝╚═╝  ╚═╝\n", style=f"bold {COLORS['secondary']}")
-        banner.append("\n")
+        # The logo only depends on the theme colors, so it is built once per theme
+        colors = (COLORS["primary"], COLORS["secondary"])
+        if MarkInterface._logo is None or MarkInterface._logo[0] != colors:
+            logo = Text("\n")
+            for i, line in enumerate(_LOGO_LINES):
+                logo.append(line, style=f"bold {colors[i >= 3]}")
+            logo.append("\n")
+            MarkInterface._logo = (colors, logo)
+        self.console.print(MarkInterface._logo[1], end="")
         
         # Pick a random splash message
         splash = random.choice(SPLASH_MESSAGES)
-        banner.append(f"  {splash} ", style=f"italic {COLORS['muted']}")
-        banner.append(" | ", style=COLORS["muted"])
-        banner.append("v1.3.0\n", style=COLORS["info"])
-        banner.append("\n")
+        banner = Text.assemble(
+            (f"  {splash} ", _sty("muted") + _ITALIC),
+            (" | ", _sty("muted")),
+            ("v1.3.0\n", _sty("info")),
+            "\n",
+        )
         
         self.console.print(banner)
     
     def print_header(self, model: str, provider: str, connected: bool = True):
         """Print the header panel."""
         self.header.update(model=model, provider=provider, connected=connected)
-        self.console.print(self.header.render())
-        self.console.print()
+        self.console.print(self.header.render(), "")
     
     def print_usage(
         self, 
@@ -120,8 +176,7 @@ class MarkInterface:
         """Print the performance panel."""
         self.console.print(PerformancePanel.render(
             cpu_usage, ram_usage
-        ))
-        self.console.print()
+        ), "")
         
     def print_response_stats(
         self,
@@ -131,43 +186,41 @@ class MarkInterface:
         total_time: float = 0.0
     ):
         """Print stats below the AI response (Tokens, TTFT, Time)."""
-        from rich.text import Text
-        
         # Determine colors
-        ttft_color = COLORS["success"] if ttft < 1.0 else (COLORS["warning"] if ttft < 3.0 else COLORS["error"])
-        
-        stats_text = Text()
-        stats_text.append("  TTFT: ", style=COLORS["muted"])
-        stats_text.append(f"{ttft:.2f}s", style=ttft_color)
-        stats_text.append(" | ", style=COLORS["muted"])
-        stats_text.append("Tokens: ", style=COLORS["muted"])
-        stats_text.append(f"{tokens_in} in / {tokens_out} out", style=COLORS["info"])
+        ttft_color = _sty("success") if ttft < 1.0 else (_sty("warning") if ttft < 3.0 else _sty("error"))
+        muted = _sty("muted")
+        info = _sty("info")
         
+        # One span per style run
+        parts = [
+            ("  TTFT: ", muted),
+            (f"{ttft:.2f}s", ttft_color),
+            (" | Tokens: ", muted),
+            (f"{tokens_in} in / {tokens_out} out", info),
+        ]
         if total_time > 0:
-            speed = tokens_out / total_time if total_time > 0 else 0
-            stats_text.append(" | ", style=COLORS["muted"])
-            stats_text.append("Time: ", style=COLORS["muted"])
-            stats_text.append(f"{total_time:.2f}s", style=COLORS["info"])
-            stats_text.append(" | ", style=COLORS["muted"])
-            stats_text.append("Speed: ", style=COLORS["muted"])
-            stats_text.append(f"{speed:.1f} t/s", style=COLORS["success"])
+            parts += [
+                (" | Time: ", muted),
+                (f"{total_time:.2f}s", info),
+                (" | Speed: ", muted),
+                (f"{tokens_out / total_time:.1f} t/s", _sty("success")),
+            ]
+        stats_text = Text.assemble(*parts)
 
-        self.console.print(stats_text)
-        self.console.print()
+        # Trailing blank line in the same write
+        self.console.print(stats_text, end="\n\n")
     
     def print_user_message(self, content: str, user_name: str = "Utente", timestamp: Optional[str] = None):
         """Print a user message."""
-        self.console.print(MessagePanel.user_message(content, user_name, timestamp))
-        self.console.print()
+        self.console.print(MessagePanel.user_message(content, user_name, timestamp), "")
     
     def print_kleos_user_message(self, content: str, user_name: str = "Utente", timestamp: Optional[str] = None):
         """Print a Kleos user message with yellow outline."""
-        from rich import box
         text = Text()
-        text.append(f"{user_name} (Kleos)", style=f"bold {COLORS['kleos']}")
+        text.append(f"{user_name} (Kleos)", style=_sty("kleos", bold=True))
         
         if timestamp:
-            text.append(f" | {timestamp}", style=COLORS["muted"])
+            text.append(f" | {timestamp}", style=_sty("muted"))
         
         panel = Panel(
             content,
@@ -177,8 +230,7 @@ class MarkInterface:
             padding=(0, 1),
             box=box.ROUNDED
         )
-        self.console.print(panel)
-        self.console.print()
+        self.console.print(panel, "")
     
     def print_ai_message(
         self, 
@@ -187,8 +239,7 @@ class MarkInterface:
         timestamp: Optional[str] = None
     ):
         """Print an AI response message."""
-        self.console.print(MessagePanel.ai_message(content, model, timestamp))
-        self.console.print()
+        self.console.print(MessagePanel.ai_message(content, model, timestamp), "")
 
     async def stream_ai_message(
         self, 
@@ -208,13 +259,14 @@ class MarkInterface:
         Returns:
             Tuple of (full_content, time_to_first_token)
         """
-        from ..config import UI_MESSAGES
-        full_content = ""
+        # Accumulate chunks as UTF-8 and decode on demand (avoids O(n^2)
+        # concatenation and keeps 1 byte per ASCII char even after emoji/CJK)
+        buf = bytearray()
         # Brille/Square loader frames
         square_frames = ["⠋", "⠙", "⠹", "⠸", "⠼", "⠴", "⠦", "⠧", "⠇", "⠏"]
-        frame_idx = 0
-        start_time = asyncio.get_event_loop().time()
-        last_update_time = 0
+        # Bound once; called for every chunk and frame
+        sleep = asyncio.sleep
+        start_time = perf_counter()
         
         # Performance stats
         ttft = 0.0
@@ -222,6 +274,17 @@ class MarkInterface:
         
         # 60FPS fluid updates (~16.6ms)
         update_interval = 0.016 
+        # Slower loader rotation (10 frames per second)
+        thinking_interval = 0.1
+        
+        # Streaming frame renderer with this message's fixed arguments bound
+        render_frame = partial(
+            MessagePanel.ai_message,
+            model=model, timestamp=timestamp, style=style, is_streaming=True
+        )
+        
+        # Set by the reader whenever there is something new to draw
+        dirty = asyncio.Event()
         
         # Initial state
         initial_msg = "▌"
@@ -232,59 +295,78 @@ class MarkInterface:
         with Live(
             MessagePanel.ai_message(initial_msg, model, timestamp, style=style),
             console=self.console,
-            refresh_per_second=60, # True 60 FPS target
-            auto_refresh=False
+            auto_refresh=False  # Frames are paced by the renderer below
         ) as live:
-            try:
+            
+            async def read_stream():
+                """Collect chunks as fast as they arrive; never renders."""
+                nonlocal ttft, first_token
+                is_cancelled = cancel_event.is_set if cancel_event is not None else _never
                 async for chunk in stream:
                     # Capture TTFT
                     if first_token:
-                        ttft = asyncio.get_event_loop().time() - start_time
+                        ttft = perf_counter() - start_time
                         first_token = False
                     
-                    if cancel_event and cancel_event.is_set():
-                        full_content += "\n\n*[Response stopped]*"
+                    if is_cancelled():
+                        buf.extend("\n\n*[Response stopped]*".encode())
                         break
                     
-                    full_content += chunk
-                    now = asyncio.get_event_loop().time()
+                    buf.extend(chunk.encode())
+                    # The thinking loader runs on its own timer and
+                    # never looks at the text
+                    if not thinking_only:
+                        dirty.set()
+            
+            async def render_frames():
+                """Redraw at most once per frame, only when the visible output changed."""
+                last_size = None
+                # Recent render durations; the sleep is shortened by their median so
+                # slow terminals still get ~60 FPS instead of piling frames up
+                render_costs: Deque[float] = deque(maxlen=10)
+                while True:
+                    await dirty.wait()
+                    dirty.clear()
+                    if len(buf) == last_size:
+                        continue
+                    last_size = len(buf)
                     
-                    # Update UI on interval
-                    if now - last_update_time > update_interval:
-                        if thinking_only:
-                            # Slower rotation (10 frames per second rotation)
-                            slow_frame_idx = int(now * 10) 
-                            frame = square_frames[slow_frame_idx % len(square_frames)]
-                            
-                            elapsed = int(now - start_time)
-                            
-                            # Force English for fixed UI elements per user request
-                            status_text = f"Thinking for {elapsed}s"
-                            
-                            loader_text = Text()
-                            # Yellow loader icon (always yellow for brand consistency)
-                            loader_text.append(f"{frame} ", style="bold #fde047")
-                            loader_text.append(status_text, style="italic")
-                            
-                            live.update(MessagePanel.ai_message(
-                                loader_text, 
-                                model, timestamp, style=style, is_streaming=True
-                            ))
-                        else:
-                            # Live Markdown update with 60FPS pacing
-                            live.update(MessagePanel.ai_message(
-                                full_content + "▌", 
-                                model, timestamp, style=style, is_streaming=True
-                            ))
-                        live.refresh()
-                        last_update_time = now
+                    # Live Markdown update with 60FPS pacing
+                    started = perf_counter()
+                    live.update(render_frame(buf.decode() + "▌"))
+                    live.refresh()
+                    render_costs.append(perf_counter() - started)
                     
-                    # Ultra-small sleep to keep event loop responsive for 60fps
-                    await asyncio.sleep(0.001)
+                    net_delay = median(render_costs)
+                    await sleep(update_interval - min(net_delay, update_interval - 0.001))
+            
+            async def animate_thinking():
+                """Advance the loader on a fixed tick, whether or not chunks arrive."""
+                frames = itertools.cycle(square_frames)
+                while True:
+                    await sleep(thinking_interval)
+                    elapsed = int(perf_counter() - start_time)
+                    loader_text = _loader_text(next(frames), elapsed).copy()
                     
-            except Exception:
-                pass
+                    live.update(render_frame(loader_text))
+                    live.refresh()
+            
+            renderer = asyncio.ensure_future(
+                animate_thinking() if thinking_only else render_frames()
+            )
+            try:
+                # Stream errors propagate to the caller, which reports them
+                # instead of keeping a partial reply
+                await read_stream()
+            finally:
+                renderer.cancel()
+                try:
+                    await renderer
+                except asyncio.CancelledError:
+                    pass
 
+            full_content = buf.decode()
+            
             # Final render: use final_style/model if provided
             actual_final_style = final_style or style
             actual_final_model = final_model or model
@@ -295,8 +377,7 @@ class MarkInterface:
     
     def print_system_message(self, content: str, style: str = "info"):
         """Print a system message."""
-        self.console.print(MessagePanel.system_message(content, style))
-        self.console.print()
+        self.console.print(MessagePanel.system_message(content, style), "")
     
     def print_error(
         self, 
@@ -305,18 +386,15 @@ class MarkInterface:
         suggestion: Optional[str] = None
     ):
         """Print an error message."""
-        self.console.print(ErrorPanel.render(message, title, suggestion))
-        self.console.print()
+        self.console.print(ErrorPanel.render(message, title, suggestion), "")
     
     def print_help(self):
         """Print the help table."""
-        self.console.print(HelpTable.render())
-        self.console.print()
+        self.console.print(HelpTable.render(), "")
     
     def print_memories(self, memories: List[Dict[str, Any]]):
         """Print memory list."""
-        self.console.print(MemoryList.render(memories))
-        self.console.print()
+        self.console.print(MemoryList.render(memories), "")
     
     def print_stats(
         self,
@@ -328,8 +406,7 @@ class MarkInterface:
         """Print detailed statistics."""
         self.console.print(StatsPanel.render(
             session_stats, db_stats, provider, model
-        ))
-        self.console.print()
+        ), "")
     
     def print_footer(self):
         """Print the footer bar."""
@@ -346,15 +423,11 @@ class MarkInterface:
             User input string
         """
         try:
-            styled_prompt = Text()
-            styled_prompt.append("  ", style="")
-            styled_prompt.append(prompt_text, style=f"bold {COLORS['user']}")
-            
-            return self.console.input(styled_prompt)
+            return self.console.input(_styled_prompt(prompt_text, _sty("user", bold=True)).copy())
         except EOFError:
             return "/quit"
         except KeyboardInterrupt:
-            self.console.print()
+            self.console.line()
             return ""
         
     def toggle_stats(self, config):
@@ -376,8 +449,7 @@ class MarkInterface:
             title=title,
             title_align="left",
             border_style=COLORS.get(style, COLORS["info"]),
-        ))
-        self.console.print()
+        ), "")
 
 
 # =============================================================================
@@ -389,6 +461,10 @@ class SetupWizard:
     
     def __init__(self, console: Optional[Console] = None):
         self.console = console or Console()
+        
+        # Static labels, built once per wizard
+        self._title_user_name = Text("USER NAME", style=_sty("secondary", bold=True))
+        self._label_user_name = Text("   What should I call you?", style=COLORS["info"])
     
     def run(self) -> Dict[str, Any]:
         """
@@ -400,26 +476,22 @@ class SetupWizard:
         self.console.clear()
         
         # Welcome
-        self.console.print()
+        self.console.line()
         self.console.print(Panel(
             "Welcome to MARK! 🎉\n\n"
             "Let's configure the application together.",
             title="🚀 Initial Setup",
             title_align="left",
             border_style=COLORS["primary"],
-        ))
-        self.console.print()
+        ), "")
         
         config = {}
         
         # User Name
-        self.console.print(Text(
-            "USER NAME",
-            style=f"bold {COLORS['secondary']}"
-        ))
+        self.console.print(self._title_user_name)
         
         user_name = Prompt.ask(
-            Text("   What should I call you?", style=COLORS["info"]),
+            self._label_user_name,
             default="User",
             console=self.console
         )
@@ -3,24 +3,35 @@
 # Performance Panel (System Stats Only)
 # =============================================================================
 
+from typing import Optional, Tuple
+
 from rich.panel import Panel
 from rich.text import Text
 from rich.table import Table
-from .components import COLORS
+from .components import COLORS, _sty
 
 class PerformancePanel:
     """Panel showing real-time system performance metrics (Top Bar)."""
     
-    @staticmethod
+    # Last rendered panel: (key, panel)
+    _cache: Optional[Tuple[tuple, Panel]] = None
+    
+    @classmethod
     def render(
+        cls,
         cpu_usage: float,
         ram_usage: float,
     ) -> Panel:
         """Render the system performance panel."""
+        # Reuse the last panel while the displayed values are unchanged
+        # (apply_theme drops it when the colors change)
+        key = (round(cpu_usage, 1), round(ram_usage, 1))
+        if cls._cache is not None and cls._cache[0] == key:
+            return cls._cache[1]
         
         # Colors: < 60% good, < 80% ok, > 80% warn
-        cpu_color = COLORS["success"] if cpu_usage < 60 else (COLORS["warning"] if cpu_usage < 80 else COLORS["error"])
-        ram_color = COLORS["success"] if ram_usage < 60 else (COLORS["warning"] if ram_usage < 80 else COLORS["error"])
+        cpu_color = _sty("success") if cpu_usage < 60 else (_sty("warning") if cpu_usage < 80 else _sty("error"))
+        ram_color = _sty("success") if ram_usage < 60 else (_sty("warning") if ram_usage < 80 else _sty("error"))
 
         # Grid construction
         main_table = Table.grid(expand=True, padding=(0, 4))
@@ -35,14 +46,16 @@ class PerformancePanel:
         main_table.add_row(
             Text(f"CPU: {cpu_usage:.1f}%", style=cpu_color),
             Text(f"RAM: {ram_usage:.1f}%", style=ram_color),
-            Text("GPU: N/A", style=COLORS["muted"]),
-            Text("TEMP: N/A", style=COLORS["muted"]),
+            Text("GPU: N/A", style=_sty("muted")),
+            Text("TEMP: N/A", style=_sty("muted")),
         )
         
-        return Panel(
+        panel = Panel(
             main_table,
             title="SYSTEM MONITOR",
             title_align="center",
             border_style=COLORS["border"],
             padding=(0, 1),
         )
+        cls._cache = (key, panel)
+        return panel
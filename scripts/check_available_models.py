@@ -21,15 +21,13 @@ async def main():
     
     print("Listing models matching 'gemma'...")
     try:
-        # Pager through models
+        # Async pager: pages are fetched without blocking the event loop
         count = 0
-        for model in client.models.list():
-            if "gemma" in model.name.lower():
+        async for model in await client.aio.models.list():
+            name = model.name.lower()
+            if "gemma" in name or ("gemini" in name and "flash" in name):
                 print(f"- {model.name} ({model.display_name})")
                 count += 1
-            if "gemini" in model.name.lower() and "flash" in model.name.lower():
-                 print(f"- {model.name} ({model.display_name})")
-                 count += 1
         
         if count == 0:
             print("No matching models found.")
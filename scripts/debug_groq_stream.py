@@ -50,12 +50,7 @@ async def debug_stream():
         print(f"Error: {e}")
 
 if __name__ == "__main__":
-    # The provider wraps the sync call in thread.
-    # Let's just run it simply first.
     try:
-        import asyncio
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
-        loop.run_until_complete(debug_stream())
+        asyncio.run(debug_stream())
     except KeyboardInterrupt:
         pass
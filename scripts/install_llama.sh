@@ -0,0 +1,27 @@
+#!/usr/bin/env bash
+#
+# MARK llama.cpp installer
+#
+# Rebuilds llama-cpp-python from source for this machine instead of using a
+# generic wheel: native CPU instructions (AVX2/AVX-512/FMA), plus Metal on
+# Apple Silicon or CUDA when an NVIDIA GPU is present.
+#
+# Extra CMake flags can be passed through LLAMA_CPP_CMAKE_ARGS.
+
+set -euo pipefail
+
+PYTHON="${PYTHON:-python}"
+CMAKE_ARGS="-DGGML_NATIVE=on"
+
+if [ "$(uname -s)" = "Darwin" ] && [ "$(uname -m)" = "arm64" ]; then
+    CMAKE_ARGS="$CMAKE_ARGS -DGGML_METAL=on"
+elif command -v nvidia-smi >/dev/null 2>&1; then
+    CMAKE_ARGS="$CMAKE_ARGS -DGGML_CUDA=on"
+fi
+
+CMAKE_ARGS="$CMAKE_ARGS ${LLAMA_CPP_CMAKE_ARGS:-}"
+
+echo "Building llama-cpp-python with: $CMAKE_ARGS"
+CMAKE_ARGS="$CMAKE_ARGS" FORCE_CMAKE=1 "$PYTHON" -m pip install \
+    --upgrade --force-reinstall --no-cache-dir --no-binary llama-cpp-python \
+    llama-cpp-python
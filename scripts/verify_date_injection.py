@@ -1,9 +1,9 @@
 import sys
-import os
 import datetime
+from pathlib import Path
 
 # Add project root to path
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
 
 from mark_cli.config import get_system_prompt
 
@@ -1,8 +1,9 @@
-import sys
 import os
+import sys
+from pathlib import Path
 
 # Add project root to path
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
 
 from mark_cli.config import load_config, get_system_prompt
 
@@ -10,8 +11,10 @@ print("--- Testing Name Injection ---")
 test_name = "Valerio"
 prompt = get_system_prompt("en", user_name=test_name)
 
-print("Prompt snippet:")
-print(prompt[:200])
+# The preview is only for humans; set MARK_VERBOSE=1 to show it
+if os.environ.get("MARK_VERBOSE") == "1":
+    print("Prompt snippet:")
+    print(prompt[:200])
 
 if test_name in prompt:
     print(f"\n[SUCCESS] User name '{test_name}' found in prompt.")
@@ -1,10 +1,10 @@
 import sys
-import os
 import asyncio
 from unittest.mock import MagicMock, patch
+from pathlib import Path
 
 # Add project root to path with priority
-sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
 
 from mark_cli.config import load_config, DEFAULT_PROVIDER, AVAILABLE_MODELS, get_api_key
 from mark_cli.providers.gemini import GeminiProvider
@@ -36,21 +36,25 @@ async def verify_updates():
 
     # 3. Verify API key migration logic
     print(f"\n[3] Verifying API key migration logic...")
-    with patch('keyring.get_password') as mock_keyring:
-        def side_effect(service, name):
-            if name == "GOOGLE_api_key": return None
-            if name == "gemini_api_key": return "migrated_key_123"
-            return None
-        
-        mock_keyring.side_effect = side_effect
-        
-        key = get_api_key("GOOGLE")
-        print(f"    Retrieved key for GOOGLE: {key}")
-        
-        if key == "migrated_key_123":
-            print("    [SUCCESS] API key migration logic working.")
-        else:
-            print("    [FAIL] API key migration logic failed.")
+    key = get_api_key("GOOGLE")
+    print(f"    Retrieved key for GOOGLE: {key}")
+    
+    if key == "migrated_key_123":
+        print("    [SUCCESS] API key migration logic working.")
+    else:
+        print("    [FAIL] API key migration logic failed.")
+
+def keyring_side_effect(service, name):
+    """Keyring with only the pre-migration "gemini" key stored."""
+    if name == "GOOGLE_api_key": return None
+    if name == "gemini_api_key": return "migrated_key_123"
+    return None
 
 if __name__ == "__main__":
-    asyncio.run(verify_updates())
+    # Keyring is patched once for the whole run
+    keyring_patch = patch('keyring.get_password', side_effect=keyring_side_effect)
+    keyring_patch.start()
+    try:
+        asyncio.run(verify_updates())
+    finally:
+        keyring_patch.stop()
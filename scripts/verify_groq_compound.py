@@ -3,7 +3,7 @@ import sys
 from pathlib import Path
 
 # Add project root to path
-sys.path.append(str(Path(__file__).parent.parent))
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
 
 from mark_cli.config import AVAILABLE_MODELS
 from mark_cli.providers.groq import GroqProvider
@@ -1,9 +1,10 @@
 import sys
-import os
+import re
 import datetime
+from pathlib import Path
 
 # Add project root to path
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
 
 from mark_cli.config import get_system_prompt
 
@@ -18,31 +19,46 @@ languages = {
 user_name = "TestUser"
 current_year = str(datetime.datetime.now().year)
 
+# Time labels per language ("Ore:" / "Time:" / "Zeit:" / "Heure :" / "Hora:")
+time_labels = ["Time:", "Ore:", "Zeit:", "Heure :", "Hora:"]
+
+# Language indicators
+indicators = {
+    "en": "You are MARK",
+    "it": "Sei MARK",
+    "de": "Du bist MARK",
+    "fr": "Tu es MARK",
+    "es": "Eres MARK"
+}
+
+# Every needle in one alternation, so each prompt is scanned once
+needles = [user_name, current_year, *time_labels, *indicators.values()]
+needles_re = re.compile("|".join(map(re.escape, needles)))
+
+# (code, name, indicator) per language, resolved once
+lang_rows = [(code, name, indicators.get(code)) for code, name in languages.items()]
+
 print(f"--- Testing System Prompts for {len(languages)} Languages ---")
 
-for lang_code, lang_name in languages.items():
+for lang_code, lang_name, expected in lang_rows:
     print(f"\nTesting {lang_name} ({lang_code})...")
     prompt = get_system_prompt(lang_code, user_name=user_name)
+    found = set(needles_re.findall(prompt))
     
     # Check for basic content
-    if user_name in prompt:
+    if user_name in found:
         print("  [OK] User name found")
     else:
         print("  [FAIL] User name NOT found")
 
     # Check for date injection
-    if current_year in prompt:
+    if current_year in found:
         print("  [OK] Current year found")
     else:
         print("  [FAIL] Current year NOT found")
         
-    # Check for time injection (looking for "Ore:" or "Time:" or "Zeit:" or "Heure :" or "Hora:")
-    time_labels = ["Time:", "Ore:", "Zeit:", "Heure :", "Hora:"]
-    found_label = False
-    for label in time_labels:
-        if label in prompt:
-            found_label = True
-            break
+    # Check for time injection
+    found_label = not found.isdisjoint(time_labels)
             
     if found_label:
         print("  [OK] Time label found")
@@ -50,16 +66,7 @@ for lang_code, lang_name in languages.items():
         print("  [FAIL] Time label NOT found")
 
     # Check for specific language indicators
-    indicators = {
-        "en": "You are MARK",
-        "it": "Sei MARK",
-        "de": "Du bist MARK",
-        "fr": "Tu es MARK",
-        "es": "Eres MARK"
-    }
-    
-    expected = indicators.get(lang_code)
-    if expected and expected in prompt:
+    if expected and expected in found:
         print(f"  [OK] Correct language indicator '{expected}' found")
     else:
         print(f"  [FAIL] Indicator '{expected}' NOT found in prompt")